@@ -2,13 +2,18 @@
 FastAPI 서버 - KIS API 실시간 호출 엔드포인트
 Refresh 버튼 클릭 시 최신 주식 데이터를 실시간으로 수집하여 반환
 """
+import asyncio
 import os
 import sys
+import time
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
 
-from fastapi import FastAPI
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 # 프로젝트 루트를 sys.path에 추가 (모듈 import 위해)
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -22,21 +27,46 @@ from modules.stock_filter import StockFilter
 from modules.stock_history import StockHistoryAPI
 from modules.exchange_rate import ExchangeRateAPI
 from modules.data_exporter import _strip_meta
-from modules.utils import KST
-from main import collect_all_stocks
-
-app = FastAPI(title="Stock TOP10 API", version="1.0.0")
-
-# CORS 설정
-ALLOWED_ORIGINS = os.environ.get("CORS_ORIGINS", "").split(",")
-ALLOWED_ORIGINS = [o.strip() for o in ALLOWED_ORIGINS if o.strip()]
-# 기본 허용 도메인
-ALLOWED_ORIGINS += [
-    "http://localhost:5173",
-    "http://localhost:4173",
-    "http://127.0.0.1:5173",
-    "https://xxonbang.github.io",
-]
+from modules.utils import KST, now_kst_str
+from modules.stock_collector import collect_all_stocks
+
+# orjson(C 구현)으로 응답 직렬화 - 대형 refresh 페이로드에서 stdlib json 대비 수 배 빠름
+app = FastAPI(title="Stock TOP10 API", version="1.0.0", default_response_class=ORJSONResponse)
+
+# 프로세스 수명 동안 재사용하는 공유 HTTP 세션
+# keep-alive로 refresh마다 반복되던 TCP+TLS 핸드셰이크를 생략
+_kis_session = requests.Session()
+# KIS 커넥션 풀 확장은 여기서 1회만 수행 (KISClient는 주입된 세션을
+# 재마운트하지 않으므로 refresh 간에도 풀이 유지됨)
+_kis_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+_exchange_session = requests.Session()
+
+# /api/refresh TTL 캐시: TTL 이내 반복/동시 호출은 전체 파이프라인 재실행 없이
+# 메모이즈된 응답을 반환 (락으로 동시 요청을 1회 수집으로 병합)
+_REFRESH_TTL = 30  # 초
+
+# Phase별 데드라인 (초): 외부 API 장애 시 90초 전체 타임아웃까지 끌지 않고
+# 해당 단계에서 빠르게 실패하거나 부분 결과로 진행
+_PHASE_B_TIMEOUT = 45  # 환율 + KIS 랭킹 4종
+_PHASE_D_TIMEOUT = 30  # 히스토리 + 투자자 데이터
+_refresh_cache = {"ts": 0.0, "body": None}  # body: 직렬화된 JSON bytes
+_refresh_lock = asyncio.Lock()
+
+# 환율 캐시: search_date는 하루 단위로만 바뀌므로 30분 TTL로 충분
+_EXCHANGE_TTL = 1800  # 초
+_exchange_cache = {"ts": 0.0, "date": "", "data": None}
+
+# CORS 설정: 환경변수 + 기본 허용 도메인을 중복 제거하여 고정 튜플로 구성
+# (CORSMiddleware가 요청마다 선형 탐색하므로 중복 항목은 비교 낭비)
+ALLOWED_ORIGINS = tuple(sorted(
+    {o.strip() for o in os.environ.get("CORS_ORIGINS", "").split(",") if o.strip()}
+    | {
+        "http://localhost:5173",
+        "http://localhost:4173",
+        "http://127.0.0.1:5173",
+        "https://xxonbang.github.io",
+    }
+))
 
 app.add_middleware(
     CORSMiddleware,
@@ -50,7 +80,7 @@ app.add_middleware(
 @app.get("/api/health")
 def health():
     """헬스체크 (keep-alive ping용)"""
-    return {"status": "ok", "version": "v3", "timestamp": datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S")}
+    return {"status": "ok", "version": "v3", "timestamp": now_kst_str()}
 
 
 def _check_kis_connectivity() -> "str | None":
@@ -67,18 +97,26 @@ def _check_kis_connectivity() -> "str | None":
         return f"KIS API 서버에 연결할 수 없습니다: {e}"
 
 
-def _refresh_sync():
-    """실시간 데이터 수집 로직 (동기)"""
+async def _collect_rankings():
+    """Phase 0~C 실행: 연결 확인 → 랭킹 수집 → 교차 필터링
+
+    KIS 클라이언트 계층은 동기(requests) 기반이므로 블로킹 구간은
+    asyncio.to_thread로 이벤트 루프의 공용 executor에 위임합니다.
+    (요청마다 ThreadPoolExecutor를 생성/해제하지 않음)
+
+    Returns:
+        실패 시 {"error": ...}, 성공 시 Phase D/E에 필요한 상태 dict
+    """
     errors = []
 
     # === Phase 0: KIS API 연결 테스트 (빠른 실패) ===
-    conn_error = _check_kis_connectivity()
+    conn_error = await asyncio.to_thread(_check_kis_connectivity)
     if conn_error:
         return {"error": conn_error}
 
     # === Phase A: KIS Client 초기화 (순차 필수) ===
     try:
-        client = KISClient()
+        client = await asyncio.to_thread(KISClient, session=_kis_session)
         rank_api = KISRankAPI(client)
         history_api = StockHistoryAPI(client)
     except Exception as e:
@@ -94,105 +132,129 @@ def _refresh_sync():
     fluctuation_direct_data = {}
 
     def fetch_exchange():
-        return ExchangeRateAPI().get_exchange_rates()
+        today = datetime.now(KST).strftime("%Y%m%d")
+        if (
+            _exchange_cache["data"] is not None
+            and _exchange_cache["date"] == today
+            and time.monotonic() - _exchange_cache["ts"] < _EXCHANGE_TTL
+        ):
+            return _exchange_cache["data"]
+        data = ExchangeRateAPI(session=_exchange_session).get_exchange_rates()
+        if data.get("rates"):
+            _exchange_cache.update({"ts": time.monotonic(), "date": today, "data": data})
+        return data
 
     def fetch_kis_rankings():
-        """KIS 랭킹 API 4종을 순차 실행하여 rate limit 회피"""
+        """KIS 랭킹 API 4종을 순차 실행하여 rate limit 회피
+
+        _strip_meta는 워커 스레드에서 바로 적용하여
+        응답 조립(Phase E)의 직렬 구간에서 CPU 비용을 제거합니다.
+        """
         results = {}
         # 거래량 (critical)
-        results["volume"] = rank_api.get_top30_by_volume(exclude_etf=True)
+        results["volume"] = _strip_meta(rank_api.get_top30_by_volume(exclude_etf=True))
         # 거래대금 (non-critical)
         try:
-            results["trading_value"] = rank_api.get_top30_by_trading_value(exclude_etf=True)
+            results["trading_value"] = _strip_meta(
+                rank_api.get_top30_by_trading_value(exclude_etf=True)
+            )
         except Exception as e:
             results["trading_value_error"] = str(e)
         # 등락폭 (critical)
-        results["fluctuation"] = rank_api.get_top30_by_fluctuation(exclude_etf=True)
+        results["fluctuation"] = _strip_meta(rank_api.get_top30_by_fluctuation(exclude_etf=True))
         # 등락률 전용 API (non-critical)
         try:
-            results["fluctuation_direct"] = rank_api.get_top_fluctuation_direct(exclude_etf=True)
+            results["fluctuation_direct"] = _strip_meta(
+                rank_api.get_top_fluctuation_direct(exclude_etf=True)
+            )
         except Exception as e:
             results["fluctuation_direct_error"] = str(e)
         return results
 
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        future_exchange = executor.submit(fetch_exchange)
-        future_kis = executor.submit(fetch_kis_rankings)
-
-        # 환율 (non-critical)
-        try:
-            exchange_data = future_exchange.result()
-        except Exception as e:
-            errors.append(f"환율 조회 실패: {e}")
-
-        # KIS 랭킹 4종
-        try:
-            kis_results = future_kis.result()
-        except Exception as e:
-            return {"error": f"KIS 랭킹 조회 실패: {e}", "errors": errors}
-
-        # critical 결과 추출
-        volume_data = kis_results.get("volume")
-        if not volume_data:
-            return {"error": "거래량 조회 실패", "errors": errors}
-
-        fluctuation_data = kis_results.get("fluctuation")
-        if not fluctuation_data:
-            return {"error": "등락폭 조회 실패", "errors": errors}
-
-        # non-critical 결과 추출
-        if "trading_value_error" in kis_results:
-            errors.append(f"거래대금 조회 실패: {kis_results['trading_value_error']}")
-        else:
-            trading_value_data = kis_results.get("trading_value", {})
-
-        if "fluctuation_direct_error" in kis_results:
-            errors.append(f"등락률 전용 API 실패: {kis_results['fluctuation_direct_error']}")
-        else:
-            fluctuation_direct_data = kis_results.get("fluctuation_direct", {})
-
-    # === Phase C: 교차 필터링 + all_stocks 수집 (in-memory, 순차) ===
-    stock_filter = StockFilter()
-    rising_stocks = stock_filter.filter_rising_stocks(volume_data, fluctuation_data)
-    falling_stocks = stock_filter.filter_falling_stocks(volume_data, fluctuation_data)
-
-    all_stocks = collect_all_stocks(
-        rising_stocks, falling_stocks,
-        volume_data=volume_data,
-        trading_value_data=trading_value_data,
-        fluctuation_data=fluctuation_data,
-        fluctuation_direct_data=fluctuation_direct_data,
-    )
-
-    # === Phase D: 히스토리 + 투자자 데이터 병렬 실행 ===
-    history_data = {}
-    investor_data = {}
-    investor_estimated = False
-
-    def fetch_history():
-        return history_api.get_multiple_stocks_history(all_stocks, days=3)
-
-    def fetch_investor():
-        return rank_api.get_investor_data_auto(all_stocks)
-
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        future_history = executor.submit(fetch_history)
-        future_investor = executor.submit(fetch_investor)
+    try:
+        exchange_result, kis_results = await asyncio.wait_for(
+            asyncio.gather(
+                asyncio.to_thread(fetch_exchange),
+                asyncio.to_thread(fetch_kis_rankings),
+                return_exceptions=True,
+            ),
+            timeout=_PHASE_B_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        return {"error": f"KIS 랭킹 조회 시간 초과 ({_PHASE_B_TIMEOUT}초)", "errors": errors}
+
+    # 환율 (non-critical)
+    if isinstance(exchange_result, BaseException):
+        errors.append(f"환율 조회 실패: {exchange_result}")
+    else:
+        exchange_data = exchange_result
+
+    # KIS 랭킹 4종
+    if isinstance(kis_results, BaseException):
+        return {"error": f"KIS 랭킹 조회 실패: {kis_results}", "errors": errors}
+
+    # critical 결과 추출
+    volume_data = kis_results.get("volume")
+    if not volume_data:
+        return {"error": "거래량 조회 실패", "errors": errors}
+
+    fluctuation_data = kis_results.get("fluctuation")
+    if not fluctuation_data:
+        return {"error": "등락폭 조회 실패", "errors": errors}
+
+    # non-critical 결과 추출
+    if "trading_value_error" in kis_results:
+        errors.append(f"거래대금 조회 실패: {kis_results['trading_value_error']}")
+    else:
+        trading_value_data = kis_results.get("trading_value", {})
+
+    if "fluctuation_direct_error" in kis_results:
+        errors.append(f"등락률 전용 API 실패: {kis_results['fluctuation_direct_error']}")
+    else:
+        fluctuation_direct_data = kis_results.get("fluctuation_direct", {})
+
+    # === Phase C: 교차 필터링 + all_stocks 수집 (CPU-bound dict 순회) ===
+    # 이벤트 루프를 막지 않도록 워커 스레드에서 실행
+    def build_stock_lists():
+        stock_filter = StockFilter()
+        rising = stock_filter.filter_rising_stocks(volume_data, fluctuation_data)
+        falling = stock_filter.filter_falling_stocks(volume_data, fluctuation_data)
+        collected = collect_all_stocks(
+            rising, falling,
+            volume_data=volume_data,
+            trading_value_data=trading_value_data,
+            fluctuation_data=fluctuation_data,
+            fluctuation_direct_data=fluctuation_direct_data,
+        )
+        return rising, falling, collected
+
+    rising_stocks, falling_stocks, all_stocks = await asyncio.to_thread(build_stock_lists)
+
+    return {
+        "rank_api": rank_api,
+        "history_api": history_api,
+        "exchange": exchange_data,
+        "volume": volume_data,
+        "trading_value": trading_value_data,
+        "fluctuation": fluctuation_data,
+        "fluctuation_direct": fluctuation_direct_data,
+        "rising": rising_stocks,
+        "falling": falling_stocks,
+        "all_stocks": all_stocks,
+        "errors": errors,
+    }
 
-        try:
-            history_data = future_history.result()
-        except Exception as e:
-            errors.append(f"등락률 조회 실패: {e}")
 
-        try:
-            investor_data, investor_estimated = future_investor.result()
-        except Exception as e:
-            errors.append(f"수급 데이터 수집 실패: {e}")
+def _assemble_response(state, history_data, investor_data, investor_estimated):
+    """Phase E: 응답 조립 (랭킹 4종은 fetch 단계에서 이미 _strip_meta 적용됨)
 
-    # === Phase E: 응답 조립 ===
+    선택 필드는 조건부 삽입으로 구성하여 사후 None 제거 패스를 생략
+    """
+    rising_stocks = state["rising"]
+    falling_stocks = state["falling"]
     data = {
-        "timestamp": datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S"),
-        "exchange": exchange_data or {},
+        "timestamp": now_kst_str(),
+        "exchange": state["exchange"] or {},
         "rising": {
             "kospi": rising_stocks.get("kospi", []),
             "kosdaq": rising_stocks.get("kosdaq", []),
@@ -201,30 +263,167 @@ def _refresh_sync():
             "kospi": falling_stocks.get("kospi", []),
             "kosdaq": falling_stocks.get("kosdaq", []),
         },
-        "volume": _strip_meta(volume_data) if volume_data else None,
-        "trading_value": _strip_meta(trading_value_data) if trading_value_data else None,
-        "fluctuation": _strip_meta(fluctuation_data) if fluctuation_data else None,
-        "fluctuation_direct": _strip_meta(fluctuation_direct_data) if fluctuation_direct_data else None,
         "history": history_data,
         "news": {},
-        "investor_data": investor_data if investor_data else None,
-        "investor_estimated": investor_estimated if investor_data else None,
     }
+    if state["volume"]:
+        data["volume"] = state["volume"]
+    if state["trading_value"]:
+        data["trading_value"] = state["trading_value"]
+    if state["fluctuation"]:
+        data["fluctuation"] = state["fluctuation"]
+    if state["fluctuation_direct"]:
+        data["fluctuation_direct"] = state["fluctuation_direct"]
+    if investor_data:
+        data["investor_data"] = investor_data
+        data["investor_estimated"] = investor_estimated
+
+    if state["errors"]:
+        data["_warnings"] = state["errors"]
+
+    return data
 
-    # None 값 필드 제거
-    data = {k: v for k, v in data.items() if v is not None}
 
-    if errors:
-        data["_warnings"] = errors
+async def _refresh():
+    """실시간 데이터 수집 전체 파이프라인 (Phase 0~E)"""
+    state = await _collect_rankings()
+    if "error" in state:
+        return state
 
-    return data
+    errors = state["errors"]
+    history_api = state["history_api"]
+    rank_api = state["rank_api"]
+    all_stocks = state["all_stocks"]
+
+    # === Phase D: 히스토리 + 투자자 데이터 병렬 실행 ===
+    history_data = {}
+    investor_data = {}
+    investor_estimated = False
+
+    def fetch_history():
+        return history_api.get_multiple_stocks_history(all_stocks, days=3)
+
+    def fetch_investor():
+        return rank_api.get_investor_data_auto(all_stocks)
+
+    try:
+        history_result, investor_result = await asyncio.wait_for(
+            asyncio.gather(
+                asyncio.to_thread(fetch_history),
+                asyncio.to_thread(fetch_investor),
+                return_exceptions=True,
+            ),
+            timeout=_PHASE_D_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        # 부가 데이터는 없어도 응답 가능 → 부분 결과로 진행
+        errors.append(f"히스토리/수급 조회 시간 초과 ({_PHASE_D_TIMEOUT}초)")
+        history_result = investor_result = None
+
+    if isinstance(history_result, BaseException):
+        errors.append(f"등락률 조회 실패: {history_result}")
+    elif history_result is not None:
+        history_data = history_result
+
+    if isinstance(investor_result, BaseException):
+        errors.append(f"수급 데이터 수집 실패: {investor_result}")
+    elif investor_result is not None:
+        investor_data, investor_estimated = investor_result
+
+    return _assemble_response(state, history_data, investor_data, investor_estimated)
 
 
 @app.get("/api/refresh")
-def refresh():
+async def refresh():
     """실시간 데이터 수집 - latest.json과 동일한 구조 반환
 
     main.py의 step 1~9를 실행 (뉴스/텔레그램 제외)
-    독립적인 API 호출은 ThreadPoolExecutor로 병렬 실행하여 응답 시간 단축
+    독립적인 API 호출은 asyncio.gather로 병렬 실행하여 응답 시간 단축
     """
-    return _refresh_sync()
+    async with _refresh_lock:
+        # TTL 이내면 캐시 히트 (연속 클릭/동시 요청 병합, 재인코딩 없이 bytes 반환)
+        if (
+            _refresh_cache["body"] is not None
+            and time.monotonic() - _refresh_cache["ts"] < _REFRESH_TTL
+        ):
+            return Response(content=_refresh_cache["body"], media_type="application/json")
+
+        try:
+            data = await asyncio.wait_for(_refresh(), timeout=90)
+        except asyncio.TimeoutError:
+            return {"error": "데이터 수집 시간 초과 (90초)"}
+
+        if "error" in data:
+            # 에러는 캐시하지 않음 (즉시 재시도 가능해야 함)
+            return data
+
+        # 1회만 직렬화하여 캐시와 응답에 함께 사용
+        body = orjson.dumps(data)
+        _refresh_cache["ts"] = time.monotonic()
+        _refresh_cache["body"] = body
+        return Response(content=body, media_type="application/json")
+
+
+@app.get("/api/refresh/stream")
+async def refresh_stream():
+    """실시간 데이터 수집 - NDJSON 스트리밍 버전
+
+    랭킹(Phase B/C) 완료 즉시 첫 청크를 내려보내고, 히스토리/수급(Phase D)은
+    완료되는 순서대로 후속 청크로 전송합니다. 각 줄은
+    {"phase": ..., "data": ...} 형태의 JSON입니다.
+    기존 /api/refresh(단일 JSON)는 그대로 유지됩니다.
+    """
+    async def _labeled(name, func):
+        try:
+            return name, await asyncio.to_thread(func), None
+        except Exception as e:
+            return name, None, str(e)
+
+    async def _gen():
+        state = await _collect_rankings()
+        if "error" in state:
+            yield orjson.dumps({"phase": "error", "data": state}) + b"\n"
+            return
+
+        # 첫 청크: 랭킹 + 교차 필터링 결과 (프론트가 바로 렌더링 가능)
+        rankings = {
+            "timestamp": now_kst_str(),
+            "exchange": state["exchange"] or {},
+            "rising": state["rising"],
+            "falling": state["falling"],
+            "volume": state["volume"] or {},
+            "trading_value": state["trading_value"] or {},
+            "fluctuation": state["fluctuation"] or {},
+            "fluctuation_direct": state["fluctuation_direct"] or {},
+        }
+        yield orjson.dumps({"phase": "rankings", "data": rankings}) + b"\n"
+
+        history_api = state["history_api"]
+        rank_api = state["rank_api"]
+        all_stocks = state["all_stocks"]
+        errors = state["errors"]
+
+        tasks = [
+            asyncio.create_task(_labeled(
+                "history", lambda: history_api.get_multiple_stocks_history(all_stocks, days=3)
+            )),
+            asyncio.create_task(_labeled(
+                "investor", lambda: rank_api.get_investor_data_auto(all_stocks)
+            )),
+        ]
+        for fut in asyncio.as_completed(tasks):
+            name, result, err = await fut
+            if err is not None:
+                errors.append(f"{name} 조회 실패: {err}")
+                continue
+            if name == "investor":
+                investor_data, investor_estimated = result
+                chunk = {"investor_data": investor_data, "investor_estimated": investor_estimated}
+            else:
+                chunk = {"history": result}
+            yield orjson.dumps({"phase": name, "data": chunk}) + b"\n"
+
+        done = {"warnings": errors} if errors else {}
+        yield orjson.dumps({"phase": "done", "data": done}) + b"\n"
+
+    return StreamingResponse(_gen(), media_type="application/x-ndjson")
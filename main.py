@@ -6,164 +6,118 @@ KIS 거래량+등락폭 TOP10 텔레그램 발송
 import argparse
 import json
 import os
+import re
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import accumulate, islice
 from typing import Dict, List, Any
 
+# orjson(C 구현)이 있으면 대형 JSON 파싱에 사용 (stdlib json 대비 수 배 빠름)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from modules.kis_client import KISClient
 from modules.kis_rank import KISRankAPI
 from modules.stock_filter import StockFilter
 from modules.stock_history import StockHistoryAPI
-from modules.naver_news import NaverNewsAPI
 from modules.telegram import TelegramSender
 from modules.data_exporter import export_for_frontend
 from modules.exchange_rate import ExchangeRateAPI
-from modules.gemini_analyzer import analyze_themes
 from modules.fundamental import FundamentalCollector
 from modules.stock_criteria import evaluate_all_stocks
+from modules.stock_collector import collect_all_stocks
 
 
-def collect_all_stocks(
-    rising_stocks: Dict,
-    falling_stocks: Dict,
-    volume_data: Dict = None,
-    trading_value_data: Dict = None,
-    fluctuation_data: Dict = None,
-    fluctuation_direct_data: Dict = None,
-) -> List[Dict[str, Any]]:
-    """상승/하락 종목 + 추가 데이터 소스에서 중복 제거된 전체 종목 리스트 추출"""
-    seen_codes = set()
-    all_stocks = []
-
-    stock_lists = [
-        rising_stocks.get("kospi", []),
-        rising_stocks.get("kosdaq", []),
-        falling_stocks.get("kospi", []),
-        falling_stocks.get("kosdaq", []),
-    ]
-
-    # 추가 데이터 소스
-    if volume_data:
-        stock_lists.extend([volume_data.get("kospi", []), volume_data.get("kosdaq", [])])
-    if trading_value_data:
-        stock_lists.extend([trading_value_data.get("kospi", []), trading_value_data.get("kosdaq", [])])
-    if fluctuation_data:
-        stock_lists.extend([
-            fluctuation_data.get("kospi_up", []), fluctuation_data.get("kospi_down", []),
-            fluctuation_data.get("kosdaq_up", []), fluctuation_data.get("kosdaq_down", []),
-        ])
-    if fluctuation_direct_data:
-        stock_lists.extend([
-            fluctuation_direct_data.get("kospi_up", []), fluctuation_direct_data.get("kospi_down", []),
-            fluctuation_direct_data.get("kosdaq_up", []), fluctuation_direct_data.get("kosdaq_down", []),
-        ])
-
-    for stocks in stock_lists:
-        for stock in stocks:
-            code = stock.get("code", "")
-            if code and code not in seen_codes:
-                seen_codes.add(code)
-                all_stocks.append(stock)
-
-    return all_stocks
+# Gemini 대상 종목 추출 섹션 정의: (섹션 키, 시장 키 목록, 상위 N개)
+_GEMINI_TARGET_SECTIONS = (
+    ("trading_value", ("kospi", "kosdaq"), 20),  # 거래대금 TOP
+    ("rising", ("kospi", "kosdaq"), 10),         # 상승률 TOP
+    ("fluctuation", ("kospi_up", "kosdaq_up"), 20),  # 등락률 상승 TOP
+    ("volume", ("kospi", "kosdaq"), 20),         # 거래량 TOP
+)
 
 
 def _get_gemini_target_stocks(stock_context: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Gemini 프롬프트에 포함되는 주요 종목만 추출 (중복 제거)
 
     거래대금+상승률 교차 종목, 상승률 TOP, 등락률 TOP 등에서 추출.
+    섹션 테이블을 순회하며 슬라이스 복사 없이(islice) 상위 N개만 본다.
     """
-    seen_codes = set()
-    targets = []
-
-    # 거래대금 TOP (코스피/코스닥)
-    for market in ("kospi", "kosdaq"):
-        for s in stock_context.get("trading_value", {}).get(market, [])[:20]:
-            code = s.get("code", "")
-            if code and code not in seen_codes:
-                seen_codes.add(code)
-                targets.append(s)
-
-    # 상승률 TOP
-    for market in ("kospi", "kosdaq"):
-        for s in stock_context.get("rising", {}).get(market, [])[:10]:
-            code = s.get("code", "")
-            if code and code not in seen_codes:
-                seen_codes.add(code)
-                targets.append(s)
-
-    # 등락률 상승 TOP
-    for key in ("kospi_up", "kosdaq_up"):
-        for s in stock_context.get("fluctuation", {}).get(key, [])[:20]:
-            code = s.get("code", "")
-            if code and code not in seen_codes:
-                seen_codes.add(code)
-                targets.append(s)
-
-    # 거래량 TOP
-    for market in ("kospi", "kosdaq"):
-        for s in stock_context.get("volume", {}).get(market, [])[:20]:
-            code = s.get("code", "")
-            if code and code not in seen_codes:
-                seen_codes.add(code)
-                targets.append(s)
-
-    return targets
+    # 삽입 순서 유지 dict + setdefault로 멤버십 검사와 삽입을 해시 탐색 1회로 처리
+    targets: Dict[str, Dict[str, Any]] = {}
 
+    for section, keys, top_n in _GEMINI_TARGET_SECTIONS:
+        data = stock_context.get(section, {})
+        for key in keys:
+            for s in islice(data.get(key, ()), top_n):
+                code = s.get("code", "")
+                if code:
+                    targets.setdefault(code, s)
 
-def main(test_mode: bool = False, skip_news: bool = False, skip_investor: bool = False, skip_ai: bool = False):
-    """메인 실행 함수
+    return list(targets.values())
 
-    Args:
-        test_mode: 테스트 모드 (메시지 미발송, 콘솔 출력만)
-        skip_news: 뉴스 수집 건너뛰기
-        skip_investor: 수급 데이터 수집 건너뛰기
-        skip_ai: AI 테마 분석 건너뛰기
-    """
-    print("=" * 60)
-    print("  KIS 거래량+등락폭 TOP10 텔레그램 발송")
-    print(f"  실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    if test_mode:
-        print("  [테스트 모드] 텔레그램 발송 없이 콘솔 출력만 수행")
-    print("=" * 60)
 
-    # 1. 환율 정보 조회
-    print("\n[1/13] 환율 정보 조회 중...")
-    exchange_data = {}
-    try:
-        exchange_api = ExchangeRateAPI()
-        exchange_data = exchange_api.get_exchange_rates()
-        if exchange_data.get("rates"):
-            print(f"  ✓ 환율 조회 완료 (기준일: {exchange_data.get('search_date', '')})")
-            for rate in exchange_data["rates"]:
-                unit = "(100)" if rate["is_100"] else ""
-                print(f"    {rate['currency']}{unit}: {rate['rate']:,.2f}원")
-        else:
-            print("  ⚠ 환율 데이터 없음 (영업일 아닐 수 있음)")
-    except Exception as e:
-        print(f"  ✗ 환율 조회 실패: {e}")
+def _load_json_file(path: str) -> Dict[str, Any]:
+    """JSON 파일 파싱 (orjson 가용 시 우선 사용)"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
-    # 2. KIS API 연결
-    print("\n[2/13] KIS API 연결 중...")
+
+# 읽기 전용 공유 빈 시퀀스 (누락 필드 기본값으로 매번 새 리스트를 만들지 않음)
+_EMPTY: tuple = ()
+
+_BANNER = "=" * 60
+
+
+def _print_banner(title: str, body: str) -> None:
+    """배너 블록을 단일 print로 출력 (줄 단위 write 호출 절감)"""
+    print(f"\n{_BANNER}\n{title}\n{_BANNER}\n{body}")
+
+# 텔레그램 HTML 태그 제거용 패턴 (str.replace 6회 패스 대신 정규식 1패스)
+_CLEAN_HTML_RE = re.compile(r'</?(?:b|i|code)>|</a>|<a href="|">')
+_CLEAN_HTML_MAP = {'<a href="': "[", '">': "] "}
+
+
+def _clean_html(text: str) -> str:
+    """HTML 태그 제거 (콘솔 출력용)"""
+    return _CLEAN_HTML_RE.sub(lambda m: _CLEAN_HTML_MAP.get(m.group(0), ""), text)
+
+
+@lru_cache(maxsize=1)
+def _load_existing_latest() -> "Dict[str, Any] | None":
+    """기존 frontend/public/data/latest.json을 1회만 파싱하여 재사용
+
+    skip_ai 분기(10단계)와 폴백 분기(11-1단계)가 같은 파일을 읽으므로
+    첫 호출 결과를 캐시한다. 파일이 없거나 파싱 실패 시 None.
+    """
+    path = os.path.join("frontend", "public", "data", "latest.json")
     try:
-        client = KISClient()
-        rank_api = KISRankAPI(client)
-        history_api = StockHistoryAPI(client)
-        print("  ✓ KIS API 연결 성공")
-    except Exception as e:
-        print(f"  ✗ KIS API 연결 실패: {e}")
-        return
+        if os.path.exists(path):
+            return _load_json_file(path)
+    except Exception:
+        pass
+    return None
 
-    # 2-1. 코스닥 지수 이동평균선 분석 (API 페이지당 50건 제한 → 여러 페이지 조회)
-    kosdaq_index_data = None
-    print("\n[2-1/13] 코스닥 지수 이동평균선 분석 중...")
+
+def _analyze_kosdaq_index(client: KISClient) -> Dict[str, Any]:
+    """코스닥 지수 이동평균선 분석 (API 페이지당 50건 제한 → 여러 페이지 조회)
+
+    Returns:
+        MA 분석 결과 dict, 실패/데이터 부족 시 None
+    """
     for attempt in range(3):
         try:
             if attempt > 0:
                 time.sleep(3 * attempt)
-                print(f"  재시도 ({attempt + 1}/3)...")
+                print(f"  [코스닥 지수] 재시도 ({attempt + 1}/3)...")
 
-            all_items = []
+            closes = []
+            total_items = 0
             end_date = datetime.now().strftime("%Y%m%d")
             for page in range(3):  # 최대 3페이지 (150건)
                 start_date = (datetime.now() - timedelta(days=300)).strftime("%Y%m%d")
@@ -178,31 +132,36 @@ def main(test_mode: bool = False, skip_news: bool = False, skip_investor: bool =
                 page_items = idx_resp.get("output2", [])
                 if not page_items:
                     break
-                all_items.extend(page_items)
-                if len(all_items) >= 120:
+                total_items += len(page_items)
+                # 페이지 수신 즉시 파싱하여 유효 종가 기준으로 중단 판정
+                # (원시 건수 기준이면 무효 항목 탓에 MA120 미달인 채 조기 종료 가능)
+                append_close = closes.append  # 루프 내 속성 조회 제거
+                for item in page_items:
+                    try:
+                        val = float(item.get("bstp_nmix_prpr", 0))
+                    except (ValueError, TypeError):
+                        continue
+                    if val > 0:
+                        append_close(val)
+                if len(closes) >= 120:
                     break
                 # 다음 페이지: 마지막 날짜 하루 전부터
                 last_date = page_items[-1].get("stck_bsop_date", "")
                 if not last_date:
                     break
-                end_date = (datetime.strptime(last_date, "%Y%m%d") - timedelta(days=1)).strftime("%Y%m%d")
-
-            closes = []
-            for item in all_items:
-                try:
-                    val = float(item.get("bstp_nmix_prpr", 0))
-                    if val > 0:
-                        closes.append(val)
-                except (ValueError, TypeError):
-                    continue
+                # strptime/strftime 대신 date 연산 (포맷 문자열 해석 비용 제거)
+                prev = date(int(last_date[:4]), int(last_date[4:6]), int(last_date[6:8])) - timedelta(days=1)
+                end_date = f"{prev.year:04d}{prev.month:02d}{prev.day:02d}"
 
             if len(closes) >= 60:
                 current = closes[0]
-                ma5 = sum(closes[:5]) / 5
-                ma10 = sum(closes[:10]) / 10
-                ma20 = sum(closes[:20]) / 20
-                ma60 = sum(closes[:60]) / 60
-                ma120 = sum(closes[:120]) / 120 if len(closes) >= 120 else 0
+                # 누적합 1회로 모든 구간 평균 계산 (구간별 sum 재스캔 제거)
+                prefix = list(accumulate(closes[:120]))
+                ma5 = prefix[4] / 5
+                ma10 = prefix[9] / 10
+                ma20 = prefix[19] / 20
+                ma60 = prefix[59] / 60
+                ma120 = prefix[119] / 120 if len(prefix) >= 120 else 0
 
                 values = [current, ma5, ma10, ma20, ma60]
                 if ma120 > 0:
@@ -211,7 +170,8 @@ def main(test_mode: bool = False, skip_news: bool = False, skip_investor: bool =
                 is_reversed = all(values[i] < values[i+1] for i in range(len(values)-1))
 
                 status = "정배열" if is_aligned else ("역배열" if is_reversed else "혼합")
-                kosdaq_index_data = {
+                print(f"  ✓ 코스닥 지수: {current:.2f} ({status}) [{len(closes)}일분 데이터]")
+                return {
                     "current": round(current, 2),
                     "ma5": round(ma5, 2),
                     "ma10": round(ma10, 2),
@@ -220,17 +180,61 @@ def main(test_mode: bool = False, skip_news: bool = False, skip_investor: bool =
                     "ma120": round(ma120, 2) if ma120 > 0 else 0,
                     "status": status,
                 }
-                print(f"  ✓ 코스닥 지수: {current:.2f} ({status}) [{len(closes)}일분 데이터]")
-                break
             else:
-                print(f"  ⚠ 코스닥 지수 데이터 부족 ({len(closes)}일분, 전체 {len(all_items)}건)")
-                break  # 데이터 부족은 재시도해도 동일
+                print(f"  ⚠ 코스닥 지수 데이터 부족 ({len(closes)}일분, 전체 {total_items}건)")
+                return None  # 데이터 부족은 재시도해도 동일
         except Exception as e:
             print(f"  ⚠ 코스닥 지수 분석 실패: {e}")
-            if attempt == 2:
-                break
+    return None
+
+
+def main(test_mode: bool = False, skip_news: bool = False, skip_investor: bool = False, skip_ai: bool = False):
+    """메인 실행 함수
+
+    Args:
+        test_mode: 테스트 모드 (메시지 미발송, 콘솔 출력만)
+        skip_news: 뉴스 수집 건너뛰기
+        skip_investor: 수급 데이터 수집 건너뛰기
+        skip_ai: AI 테마 분석 건너뛰기
+    """
+    header = [
+        _BANNER,
+        "  KIS 거래량+등락폭 TOP10 텔레그램 발송",
+        f"  실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+    ]
+    if test_mode:
+        header.append("  [테스트 모드] 텔레그램 발송 없이 콘솔 출력만 수행")
+    header.append(_BANNER)
+    print("\n".join(header))
+
+    # 독립적인 I/O 단계(환율/수급/뉴스)를 겹쳐 실행하기 위한 공용 스레드 풀
+    # KIS 랭킹 조회(3~6단계)는 rate limit 때문에 순차 유지
+    pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="pipeline")
+
+    # 1. 환율 정보 조회 (별도 서비스 → KIS 연결/랭킹 조회와 병렬 진행)
+    print("\n[1/13] 환율 정보 조회 시작 (백그라운드)...")
+    exchange_future = pool.submit(lambda: ExchangeRateAPI().get_exchange_rates())
+
+    # 2. KIS API 연결
+    print("\n[2/13] KIS API 연결 중...")
+    try:
+        client = KISClient()
+        rank_api = KISRankAPI(client)
+        history_api = StockHistoryAPI(client)
+        print("  ✓ KIS API 연결 성공")
+    except Exception as e:
+        print(f"  ✗ KIS API 연결 실패: {e}")
+        return
+
+    # 2-1. 코스닥 지수 이동평균선 분석
+    # 결과는 11-1 단계(폴백 판정) 직전에야 필요하므로 백그라운드로 실행하여
+    # 페이지네이션 왕복 지연을 랭킹 조회(3~6단계)와 겹침
+    print("\n[2-1/13] 코스닥 지수 이동평균선 분석 시작 (백그라운드)...")
+    kosdaq_future = pool.submit(_analyze_kosdaq_index, client)
 
     # 3. 거래량 TOP30 조회
+    # 확장 종목 캐시(_extended_stocks_cache)를 채우는 호출이므로 먼저 단독 실행
+    # (5단계 등락폭 조회가 같은 캐시를 재사용 — 동시 실행 시 중복 수집됨)
     print("\n[3/13] 거래량 TOP30 조회 중...")
     try:
         volume_data = rank_api.get_top30_by_volume(exclude_etf=True)
@@ -240,40 +244,56 @@ def main(test_mode: bool = False, skip_news: bool = False, skip_investor: bool =
         print(f"  ✗ 거래량 조회 실패: {e}")
         return
 
-    # 4. 거래대금 TOP30 조회
-    print("\n[4/13] 거래대금 TOP30 조회 중...")
+    # 4~6. 나머지 랭킹 3종은 상호 독립 → 병렬 조회
+    # (초당 호출 제한은 KISClient의 프로세스 전역 rate limiter가 보장)
+    print("\n[4-6/13] 거래대금/등락폭/등락률 TOP30 병렬 조회 중...")
+    tv_future = pool.submit(rank_api.get_top30_by_trading_value, exclude_etf=True)
+    fl_future = pool.submit(rank_api.get_top30_by_fluctuation, exclude_etf=True)
+    fd_future = pool.submit(rank_api.get_top_fluctuation_direct, exclude_etf=True)
+
     trading_value_data = {}
     try:
-        trading_value_data = rank_api.get_top30_by_trading_value(exclude_etf=True)
-        print(f"  ✓ 코스피: {len(trading_value_data.get('kospi', []))}개")
-        print(f"  ✓ 코스닥: {len(trading_value_data.get('kosdaq', []))}개")
+        trading_value_data = tv_future.result()
+        print(f"  ✓ 거래대금 코스피: {len(trading_value_data.get('kospi', []))}개")
+        print(f"  ✓ 거래대금 코스닥: {len(trading_value_data.get('kosdaq', []))}개")
     except Exception as e:
         print(f"  ⚠ 거래대금 조회 실패 (빈 데이터로 계속): {e}")
 
-    # 5. 등락폭 TOP30 조회 (자체 계산)
-    print("\n[5/13] 등락폭 TOP30 조회 중...")
     try:
-        fluctuation_data = rank_api.get_top30_by_fluctuation(exclude_etf=True)
-        print(f"  ✓ 코스피 상승: {len(fluctuation_data.get('kospi_up', []))}개")
-        print(f"  ✓ 코스피 하락: {len(fluctuation_data.get('kospi_down', []))}개")
-        print(f"  ✓ 코스닥 상승: {len(fluctuation_data.get('kosdaq_up', []))}개")
-        print(f"  ✓ 코스닥 하락: {len(fluctuation_data.get('kosdaq_down', []))}개")
+        fluctuation_data = fl_future.result()
+        print(f"  ✓ 등락폭 코스피 상승: {len(fluctuation_data.get('kospi_up', []))}개")
+        print(f"  ✓ 등락폭 코스피 하락: {len(fluctuation_data.get('kospi_down', []))}개")
+        print(f"  ✓ 등락폭 코스닥 상승: {len(fluctuation_data.get('kosdaq_up', []))}개")
+        print(f"  ✓ 등락폭 코스닥 하락: {len(fluctuation_data.get('kosdaq_down', []))}개")
     except Exception as e:
         print(f"  ✗ 등락폭 조회 실패: {e}")
         return
 
-    # 6. 등락률 전용 API 조회
-    print("\n[6/13] 등락률 전용 API 조회 중...")
     fluctuation_direct_data = {}
     try:
-        fluctuation_direct_data = rank_api.get_top_fluctuation_direct(exclude_etf=True)
-        print(f"  ✓ 코스피 상승: {len(fluctuation_direct_data.get('kospi_up', []))}개")
-        print(f"  ✓ 코스피 하락: {len(fluctuation_direct_data.get('kospi_down', []))}개")
-        print(f"  ✓ 코스닥 상승: {len(fluctuation_direct_data.get('kosdaq_up', []))}개")
-        print(f"  ✓ 코스닥 하락: {len(fluctuation_direct_data.get('kosdaq_down', []))}개")
+        fluctuation_direct_data = fd_future.result()
+        print(f"  ✓ 등락률 코스피 상승: {len(fluctuation_direct_data.get('kospi_up', []))}개")
+        print(f"  ✓ 등락률 코스피 하락: {len(fluctuation_direct_data.get('kospi_down', []))}개")
+        print(f"  ✓ 등락률 코스닥 상승: {len(fluctuation_direct_data.get('kosdaq_up', []))}개")
+        print(f"  ✓ 등락률 코스닥 하락: {len(fluctuation_direct_data.get('kosdaq_down', []))}개")
     except Exception as e:
         print(f"  ⚠ 등락률 전용 API 조회 실패 (빈 데이터로 계속): {e}")
 
+    # 1단계에서 백그라운드로 시작한 환율 조회 결과 회수
+    exchange_data = {}
+    try:
+        exchange_data = exchange_future.result()
+        if exchange_data.get("rates"):
+            print(f"\n  ✓ 환율 조회 완료 (기준일: {exchange_data.get('search_date', '')})")
+            for rate in exchange_data["rates"]:
+                unit = "(100)" if rate["is_100"] else ""
+                print(f"    {rate['currency']}{unit}: {rate['rate']:,.2f}원")
+        else:
+            print("\n  ⚠ 환율 데이터 없음 (영업일 아닐 수 있음)")
+    except Exception as e:
+        print(f"\n  ✗ 환율 조회 실패: {e}")
+        exchange_data = {}
+
     # 7. 교차 필터링
     print("\n[7/13] 교차 필터링 중...")
     stock_filter = StockFilter()
@@ -300,6 +320,19 @@ def main(test_mode: bool = False, skip_news: bool = False, skip_investor: bool =
     )
     print(f"  ✓ 총 {len(all_stocks)}개 종목")
 
+    # 수급(9단계)/뉴스(11단계)는 all_stocks만 필요 → 8단계 등락률 조회와 병렬 시작
+    investor_future = None
+    if not skip_investor:
+        investor_future = pool.submit(rank_api.get_investor_data_auto, all_stocks)
+    news_future = None
+    if not skip_news:
+        # --skip-news 실행에서는 import 자체를 생략
+        from modules.naver_news import NaverNewsAPI
+
+        news_future = pool.submit(
+            lambda: NaverNewsAPI().get_multiple_stocks_news(all_stocks, news_count=3)
+        )
+
     # 8. 3일간 등락률 조회
     print("\n[8/13] 3일간 등락률 조회 중...")
     try:
@@ -325,7 +358,8 @@ def main(test_mode: bool = False, skip_news: bool = False, skip_investor: bool =
         target_stocks = _get_gemini_target_stocks(stock_context_for_targets)
 
         # RSI 계산용 raw 일봉 데이터
-        daily_raw = {code: h.get("raw_daily_prices", []) for code, h in history_data.items()}
+        # 누락 시 공유 빈 튜플 사용 (종목마다 새 [] 할당 방지, 소비 측은 읽기 전용)
+        daily_raw = {code: h.get("raw_daily_prices") or _EMPTY for code, h in history_data.items()}
 
         fundamental_data = fundamental_collector.collect_all_fundamentals(target_stocks, daily_raw)
         print(f"  \u2713 {len(fundamental_data)}개 종목 펀더멘탈 수집 완료")
@@ -334,48 +368,53 @@ def main(test_mode: bool = False, skip_news: bool = False, skip_investor: bool =
 
     # 8-2. 공매도 비중 수집 (펀더멘탈 수집 대상 종목만)
     short_selling_data = {}
-    short_target_codes = set(fundamental_data.keys()) if fundamental_data else set()
-    if short_target_codes:
-        print(f"\n[8-2/13] 공매도 비중 수집 중... ({len(short_target_codes)}개 종목)")
+    # 조회에는 종목코드만 필요 → all_stocks 재필터링 없이 키 목록을 그대로 사용
+    target_codes = list(fundamental_data.keys()) if fundamental_data else []
+    if target_codes:
+        print(f"\n[8-2/13] 공매도 비중 수집 중... ({len(target_codes)}개 종목)")
         try:
             today = datetime.now().strftime("%Y%m%d")
-            target_list = [s for s in all_stocks if s.get("code", "") in short_target_codes]
-            for idx, stock in enumerate(target_list):
-                code = stock.get("code", "")
+
+            def _fetch_short(code):
+                """종목별 공매도 비중 조회. 유효 데이터 없으면 None 반환"""
                 try:
                     resp = client.get_daily_short_sale(code, today, today)
-                    if resp.get("rt_cd") == "0":
-                        output2 = resp.get("output2", [])
-                        if output2:
-                            ratio_str = output2[0].get("ssts_vol_rlim", "0")
-                            volume_str = output2[0].get("ssts_cntg_qty", "0")
-                            try:
-                                ratio = float(ratio_str)
-                                volume = int(volume_str)
-                                if ratio > 0:
-                                    short_selling_data[code] = {
-                                        "ratio": ratio,
-                                        "volume": volume,
-                                    }
-                            except (ValueError, TypeError):
-                                pass
+                    if resp.get("rt_cd") != "0":
+                        return None
+                    output2 = resp.get("output2", [])
+                    if not output2:
+                        return None
+                    ratio = float(output2[0].get("ssts_vol_rlim", "0"))
+                    volume = int(output2[0].get("ssts_cntg_qty", "0"))
+                    if ratio > 0:
+                        return {"ratio": ratio, "volume": volume}
+                except (ValueError, TypeError):
+                    pass
                 except Exception:
                     pass
-                if (idx + 1) % 50 == 0 or idx + 1 == len(target_list):
-                    print(f"  진행: {idx + 1}/{len(target_list)}")
+                return None
+
+            # 종목별 독립 호출 → 스레드 풀 병렬화 (초당 호출 제한은 KISClient가 보장)
+            with ThreadPoolExecutor(max_workers=8) as short_pool:
+                results = short_pool.map(_fetch_short, target_codes)
+                for idx, (code, result) in enumerate(zip(target_codes, results)):
+                    if result is not None:
+                        short_selling_data[code] = result
+                    if (idx + 1) % 50 == 0 or idx + 1 == len(target_codes):
+                        print(f"  진행: {idx + 1}/{len(target_codes)}")
             print(f"  ✓ {len(short_selling_data)}개 종목 공매도 데이터 수집 완료")
         except Exception as e:
             print(f"  ⚠ 공매도 수집 실패: {e}")
     else:
         print("\n[8-2/13] 공매도 비중 수집 건너뜀 (펀더멘탈 대상 없음)")
 
-    # 9. 수급(투자자) 데이터 수집
+    # 9. 수급(투자자) 데이터 수집 (8단계와 병렬로 진행된 결과 회수)
     investor_data = {}
     investor_estimated = False
-    if not skip_investor:
+    if investor_future is not None:
         print("\n[9/13] 수급(투자자) 데이터 수집 중...")
         try:
-            investor_data, investor_estimated = rank_api.get_investor_data_auto(all_stocks)
+            investor_data, investor_estimated = investor_future.result()
             label = "추정" if investor_estimated else "확정"
             print(f"  ✓ {len(investor_data)}개 종목 수급 데이터 수집 완료 ({label})")
         except Exception as e:
@@ -388,21 +427,21 @@ def main(test_mode: bool = False, skip_news: bool = False, skip_investor: bool =
     theme_analysis = None
     if skip_ai:
         # 기존 데이터에서 theme_analysis 보존
-        try:
-            existing_path = os.path.join("frontend", "public", "data", "latest.json")
-            if os.path.exists(existing_path):
-                with open(existing_path, "r", encoding="utf-8") as f:
-                    existing = json.load(f)
-                theme_analysis = existing.get("theme_analysis")
-                if theme_analysis:
-                    print("\n[10/13] AI 테마 분석 건너뜀 (기존 분석 결과 보존)")
-                else:
-                    print("\n[10/13] AI 테마 분석 건너뜀 (보존할 기존 결과 없음)")
-        except Exception:
+        existing = _load_existing_latest()
+        if existing:
+            theme_analysis = existing.get("theme_analysis")
+            if theme_analysis:
+                print("\n[10/13] AI 테마 분석 건너뜀 (기존 분석 결과 보존)")
+            else:
+                print("\n[10/13] AI 테마 분석 건너뜀 (보존할 기존 결과 없음)")
+        else:
             print("\n[10/13] AI 테마 분석 건너뜀")
     if not skip_ai:
         print("\n[10/13] AI 테마 분석 중...")
         try:
+            # --skip-ai 실행에서 Gemini 모듈 import 비용을 지불하지 않도록 지연 import
+            from modules.gemini_analyzer import analyze_themes
+
             stock_context = {
                 "rising": rising_stocks,
                 "falling": falling_stocks,
@@ -442,13 +481,12 @@ def main(test_mode: bool = False, skip_news: bool = False, skip_investor: bool =
     except Exception as e:
         print(f"  ⚠ 기준 평가 실패 (빈 데이터로 계속): {e}")
 
-    # 11. 뉴스 수집
+    # 11. 뉴스 수집 (8단계 이후 병렬로 진행된 결과 회수)
     news_data = {}
-    if not skip_news:
+    if news_future is not None:
         print("\n[11/13] 종목별 뉴스 수집 중...")
         try:
-            news_api = NaverNewsAPI()
-            news_data = news_api.get_multiple_stocks_news(all_stocks, news_count=3)
+            news_data = news_future.result()
             news_count = sum(1 for v in news_data.values() if v.get("news"))
             print(f"  ✓ {news_count}개 종목 뉴스 수집 완료")
         except Exception as e:
@@ -457,16 +495,20 @@ def main(test_mode: bool = False, skip_news: bool = False, skip_investor: bool =
     else:
         print("\n[11/13] 뉴스 수집 건너뜀")
 
-    # 11-1. 수집 실패 데이터 기존 값 폴백
+    # 2-1단계에서 백그라운드로 시작한 코스닥 지수 분석 결과 회수
+    kosdaq_index_data = None
+    try:
+        kosdaq_index_data = kosdaq_future.result()
+    except Exception as e:
+        print(f"  ⚠ 코스닥 지수 분석 실패: {e}")
+
+    # 모든 백그라운드 작업 결과를 회수했으므로 풀 정리
+    pool.shutdown(wait=False)
+
+    # 11-1. 수집 실패 데이터 기존 값 폴백 (latest.json 파싱은 1회로 캐시됨)
     _existing_data = None
     if not exchange_data.get("rates") or kosdaq_index_data is None or theme_analysis is None:
-        try:
-            existing_path = os.path.join("frontend", "public", "data", "latest.json")
-            if os.path.exists(existing_path):
-                with open(existing_path, "r", encoding="utf-8") as f:
-                    _existing_data = json.load(f)
-        except Exception:
-            pass
+        _existing_data = _load_existing_latest()
 
     if _existing_data:
         if not exchange_data.get("rates") and _existing_data.get("exchange", {}).get("rates"):
@@ -487,10 +529,14 @@ def main(test_mode: bool = False, skip_news: bool = False, skip_investor: bool =
         try:
             hist_dir = os.path.join("frontend", "public", "data", "history")
             if os.path.isdir(hist_dir):
-                for fname in sorted(os.listdir(hist_dir), reverse=True)[:10]:
+                # scandir로 파일 여부를 디렉터리 순회 중에 판별 (파일별 stat 생략)
+                # 파일명이 날짜 기반이므로 문자열 역정렬 = 최신순
+                with os.scandir(hist_dir) as it:
+                    fnames = [e.name for e in it if e.is_file() and e.name.endswith(".json")]
+                fnames.sort(reverse=True)
+                for fname in fnames[:10]:
                     fpath = os.path.join(hist_dir, fname)
-                    with open(fpath, "r", encoding="utf-8") as f:
-                        hist = json.load(f)
+                    hist = _load_json_file(fpath)
                     if hist.get("theme_analysis"):
                         theme_analysis = hist["theme_analysis"]
                         theme_count = len(theme_analysis.get("themes", []))
@@ -561,106 +607,41 @@ def main(test_mode: bool = False, skip_news: bool = False, skip_investor: bool =
     if theme_analysis:
         theme_messages = telegram.format_theme_analysis(theme_analysis)
 
-    def _clean_html(text: str) -> str:
-        """HTML 태그 제거 (콘솔 출력용)"""
-        text = text.replace("<b>", "").replace("</b>", "")
-        text = text.replace('<a href="', "[").replace('">', "] ").replace("</a>", "")
-        text = text.replace("<i>", "").replace("</i>", "")
-        text = text.replace("<code>", "").replace("</code>", "")
-        return text
-
     if test_mode:
-        print("\n" + "=" * 60)
-        print("🚀 START 바리케이트:")
-        print("=" * 60)
-        print(start_barricade)
-
-        print("\n" + "=" * 60)
-        print("📈 거래대금+상승률 메시지:")
-        print("=" * 60)
-        print(_clean_html(tv_rising_message))
-
-        print("\n" + "=" * 60)
-        print("📉 거래대금+하락률 메시지:")
-        print("=" * 60)
-        print(_clean_html(tv_falling_message))
-
-        print("\n" + "=" * 60)
-        print("📈 거래량+상승률 메시지:")
-        print("=" * 60)
-        print(_clean_html(rising_message))
-
-        print("\n" + "=" * 60)
-        print("📉 거래량+하락률 메시지:")
-        print("=" * 60)
-        print(_clean_html(falling_message))
-
-        if theme_messages:
-            for i, msg in enumerate(theme_messages, 1):
-                print("\n" + "=" * 60)
-                print(f"✨ AI 테마 분석 ({i}/{len(theme_messages)}):")
-                print("=" * 60)
-                print(_clean_html(msg))
-
-        print("\n" + "=" * 60)
-        print("🏁 END 바리케이트:")
-        print("=" * 60)
-        print(end_barricade)
-    else:
-        # 1. START 바리케이트
-        print("  START 바리케이트 발송 중...")
-        if telegram.send_message(start_barricade):
-            print("  ✓ START 바리케이트 발송 완료")
-        else:
-            print("  ✗ START 바리케이트 발송 실패")
+        _print_banner("🚀 START 바리케이트:", start_barricade)
+        _print_banner("📈 거래대금+상승률 메시지:", _clean_html(tv_rising_message))
+        _print_banner("📉 거래대금+하락률 메시지:", _clean_html(tv_falling_message))
+        _print_banner("📈 거래량+상승률 메시지:", _clean_html(rising_message))
+        _print_banner("📉 거래량+하락률 메시지:", _clean_html(falling_message))
 
-        # 2. 거래대금+상승률 메시지
-        print("  거래대금+상승률 메시지 발송 중...")
-        if telegram.send_message(tv_rising_message):
-            print("  ✓ 거래대금+상승률 메시지 발송 완료")
-        else:
-            print("  ✗ 거래대금+상승률 메시지 발송 실패")
+        for i, msg in enumerate(theme_messages, 1):
+            _print_banner(f"✨ AI 테마 분석 ({i}/{len(theme_messages)}):", _clean_html(msg))
 
-        # 3. 거래대금+하락률 메시지
-        print("  거래대금+하락률 메시지 발송 중...")
-        if telegram.send_message(tv_falling_message):
-            print("  ✓ 거래대금+하락률 메시지 발송 완료")
-        else:
-            print("  ✗ 거래대금+하락률 메시지 발송 실패")
-
-        # 4. 거래량+상승률 메시지
-        print("  거래량+상승률 메시지 발송 중...")
-        if telegram.send_message(rising_message):
-            print("  ✓ 거래량+상승률 메시지 발송 완료")
-        else:
-            print("  ✗ 거래량+상승률 메시지 발송 실패")
+        _print_banner("🏁 END 바리케이트:", end_barricade)
+    else:
+        # 발송 목록을 테이블로 구성 (START → 본문 → 테마 → END 순서 고정)
+        jobs = [
+            ("START 바리케이트", start_barricade),
+            ("거래대금+상승률 메시지", tv_rising_message),
+            ("거래대금+하락률 메시지", tv_falling_message),
+            ("거래량+상승률 메시지", rising_message),
+            ("거래량+하락률 메시지", falling_message),
+        ]
+        jobs.extend(
+            (f"AI 테마 분석 {i}/{len(theme_messages)}", msg)
+            for i, msg in enumerate(theme_messages, 1)
+        )
+        jobs.append(("END 바리케이트", end_barricade))
 
-        # 5. 거래량+하락률 메시지
-        print("  거래량+하락률 메시지 발송 중...")
-        if telegram.send_message(falling_message):
-            print("  ✓ 거래량+하락률 메시지 발송 완료")
-        else:
-            print("  ✗ 거래량+하락률 메시지 발송 실패")
-
-        # 6. AI 테마 분석 메시지
-        if theme_messages:
-            print(f"  AI 테마 분석 발송 중... ({len(theme_messages)}개)")
-            for i, msg in enumerate(theme_messages, 1):
-                if telegram.send_message(msg):
-                    print(f"  ✓ AI 테마 분석 {i}/{len(theme_messages)} 발송 완료")
-                else:
-                    print(f"  ✗ AI 테마 분석 {i}/{len(theme_messages)} 발송 실패")
-
-        # 7. END 바리케이트
-        print("  END 바리케이트 발송 중...")
-        if telegram.send_message(end_barricade):
-            print("  ✓ END 바리케이트 발송 완료")
-        else:
-            print("  ✗ END 바리케이트 발송 실패")
+        # 채팅방 내 표시 순서가 보장되어야 하므로 병렬화 없이 순차 발송
+        for label, msg in jobs:
+            print(f"  {label} 발송 중...")
+            if telegram.send_message(msg):
+                print(f"  ✓ {label} 발송 완료")
+            else:
+                print(f"  ✗ {label} 발송 실패")
 
-    print("\n" + "=" * 60)
-    print("  완료!")
-    print("=" * 60)
+    print(f"\n{_BANNER}\n  완료!\n{_BANNER}")
 
 
 if __name__ == "__main__":
@@ -3,39 +3,77 @@
 """
 import json
 import os
+import re
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any
 
 from modules.utils import KST
 
+# orjson(C 구현)이 있으면 직렬화에 사용 (stdlib json 대비 수 배 빠름)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 프로젝트 루트 경로
 ROOT_DIR = Path(__file__).parent.parent
 
+# 히스토리 파일명 형식 (YYYY-MM-DD_HHMM.json)
+# 이 모듈이 만든 파일만 만료 삭제 대상으로 판별 (수동 백업 등 보호)
+_HISTORY_NAME_RE = re.compile(r"\d{4}-\d{2}-\d{2}_\d{4}\.json")
+
+
+def _encode_json(data: Dict[str, Any]) -> bytes:
+    """JSON 직렬화 (orjson 가용 시 우선 사용)
+
+    기계가 소비하는 파일이므로 들여쓰기 없이 compact 형식으로 인코딩한다.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _dump_json(path: Path, data: Dict[str, Any]) -> None:
+    """JSON 파일 쓰기: 메모리에서 1회 인코딩 후 단일 write로 기록
+
+    (json.dump의 조각 단위 write 반복으로 인한 syscall 낭비 방지)
+    """
+    path.write_bytes(_encode_json(data))
+
 
-def save_history_file(data: Dict[str, Any], history_dir: Path) -> str:
+def save_history_file(
+    data: Dict[str, Any],
+    history_dir: Path,
+    payload: bytes = None,
+    now: datetime = None,
+) -> str:
     """날짜_시간 형식으로 히스토리 파일 저장
 
     Args:
         data: 저장할 데이터
         history_dir: 히스토리 디렉토리 경로
+        payload: 미리 인코딩된 JSON bytes (있으면 재직렬화 생략)
+        now: 기준 시각 (호출 측과 공유 시 중복 now() 계산 생략)
 
     Returns:
         저장된 파일명
     """
     history_dir.mkdir(parents=True, exist_ok=True)
 
-    now = datetime.now(KST)
+    if now is None:
+        now = datetime.now(KST)
     filename = now.strftime("%Y-%m-%d_%H%M") + ".json"
     file_path = history_dir / filename
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if payload is None:
+        payload = _encode_json(data)
+    file_path.write_bytes(payload)
 
     return filename
 
 
-def cleanup_old_history(history_dir: Path, days: int = 30) -> int:
+def cleanup_old_history(history_dir: Path, days: int = 30) -> List[str]:
     """30일 이상 된 히스토리 파일 삭제
 
     Args:
@@ -43,74 +81,122 @@ def cleanup_old_history(history_dir: Path, days: int = 30) -> int:
         days: 보관 기간 (기본 30일)
 
     Returns:
-        삭제된 파일 수
+        삭제된 파일명 리스트 (인덱스 증분 갱신에 사용)
     """
     if not history_dir.exists():
-        return 0
+        return []
+
+    # 파일명 접두사(YYYY-MM-DD)가 ISO 형식이므로 날짜 파싱 없이
+    # cutoff 문자열과의 사전순 비교만으로 만료 여부 판정 가능
+    cutoff_str = (datetime.now(KST) - timedelta(days=days)).strftime("%Y-%m-%d")
+    deleted = []
+
+    # scandir 순회: 파일별 Path 객체 생성 없이 이름 기반으로 처리
+    # 형식이 다른 파일명은 사전순 비교 전에 제외 (과거 strptime 폴백과 동일)
+    with os.scandir(history_dir) as it:
+        for entry in it:
+            name = entry.name
+            if _HISTORY_NAME_RE.fullmatch(name) and name[:10] < cutoff_str:
+                os.unlink(entry.path)
+                deleted.append(name)
+
+    return deleted
+
+
+def _index_entry(filename: str) -> Dict[str, str]:
+    """파일명(YYYY-MM-DD_HHMM.json)에서 인덱스 항목 생성"""
+    stem = filename[:-5]
+    return {
+        "filename": filename,
+        "date": stem[:10],  # YYYY-MM-DD
+        "time": stem[11:13] + ":" + stem[13:15],  # HH:MM
+        "path": f"data/history/{filename}",
+    }
 
-    cutoff_date = datetime.now(KST) - timedelta(days=days)
-    deleted_count = 0
 
-    for file_path in history_dir.glob("*.json"):
-        try:
-            # 파일명에서 날짜 추출 (YYYY-MM-DD_HHMM.json)
-            date_str = file_path.stem[:10]  # YYYY-MM-DD
-            file_date = datetime.strptime(date_str, "%Y-%m-%d")
-            file_date = file_date.replace(tzinfo=KST)
+def _scan_index_entries(history_dir: Path) -> List[Dict[str, str]]:
+    """디렉토리 전체 스캔으로 인덱스 항목 재구성 (증분 갱신 불가 시 폴백)"""
+    entries = []
+    if history_dir.exists():
+        # scandir로 파일명만 수집 후 문자열 역정렬 (파일명 형식상 최신순과 동일)
+        with os.scandir(history_dir) as it:
+            names = [e.name for e in it if e.name.endswith(".json")]
+        names.sort(reverse=True)
 
-            if file_date < cutoff_date:
-                file_path.unlink()
-                deleted_count += 1
-        except (ValueError, IndexError):
-            # 파일명 형식이 맞지 않으면 건너뜀
-            continue
+        for filename in names:
+            try:
+                entries.append(_index_entry(filename))
+            except (ValueError, IndexError):
+                continue
 
-    return deleted_count
+    return entries
 
 
-def update_history_index(output_dir: Path) -> None:
+def update_history_index(
+    output_dir: Path,
+    now: datetime = None,
+    new_filename: str = None,
+    deleted_names: List[str] = None,
+) -> None:
     """히스토리 인덱스 파일 갱신
 
+    new_filename이 주어지고 기존 인덱스가 유효하면 디렉토리 재스캔 없이
+    신규 항목 추가 + 삭제 항목 제거만 수행한다 (O(파일 수) stat 제거).
+    인덱스가 없거나 손상된 경우 전체 스캔으로 폴백.
+
     Args:
         output_dir: 데이터 출력 디렉토리 (history 상위 디렉토리)
+        now: 기준 시각 (호출 측과 공유 시 중복 now() 계산 생략)
+        new_filename: 방금 저장된 히스토리 파일명 (증분 갱신용)
+        deleted_names: cleanup_old_history가 삭제한 파일명 (증분 갱신용)
     """
     history_dir = output_dir / "history"
+    index_path = output_dir / "history-index.json"
 
-    if not history_dir.exists():
-        entries = []
-    else:
-        entries = []
-        for file_path in sorted(history_dir.glob("*.json"), reverse=True):
-            try:
-                # 파일명에서 날짜/시간 추출 (YYYY-MM-DD_HHMM.json)
-                filename = file_path.name
-                date_str = file_path.stem[:10]  # YYYY-MM-DD
-                time_str = file_path.stem[11:13] + ":" + file_path.stem[13:15]  # HH:MM
-
-                entries.append({
-                    "filename": filename,
-                    "date": date_str,
-                    "time": time_str,
-                    "path": f"data/history/{filename}",
-                })
-            except (ValueError, IndexError):
-                continue
-
+    entries = None
+    if new_filename is not None and index_path.exists():
+        try:
+            raw = index_path.read_bytes()
+            existing = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            old_entries = existing.get("entries")
+            if isinstance(old_entries, list):
+                removed = set(deleted_names or ())
+                removed.add(new_filename)  # 동일 파일명 재수집 시 중복 방지
+                entries = [_index_entry(new_filename)]
+                entries.extend(
+                    e for e in old_entries if e.get("filename") not in removed
+                )
+        except (ValueError, KeyError, AttributeError, OSError):
+            entries = None
+
+    if entries is None:
+        entries = _scan_index_entries(history_dir)
+
+    if now is None:
+        now = datetime.now(KST)
     index_data = {
-        "updated_at": datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S"),
+        "updated_at": now.strftime("%Y-%m-%d %H:%M:%S"),
         "entries": entries,
     }
 
-    index_path = output_dir / "history-index.json"
-    with open(index_path, "w", encoding="utf-8") as f:
-        json.dump(index_data, f, ensure_ascii=False, indent=2)
+    _dump_json(index_path, index_data)
+
+
+# 프론트엔드 응답에서 제외하는 메타 필드 (frozenset: O(1) 멤버십 검사)
+_META_FIELDS = frozenset({"collected_at", "category", "exclude_etf"})
 
 
 def _strip_meta(data: Dict) -> Dict:
-    """메타 필드(collected_at, category, exclude_etf) 제거하여 JSON 경량화"""
+    """메타 필드(collected_at, category, exclude_etf) 제거하여 JSON 경량화
+
+    호출 시점에 데이터 소유권이 내보내기 경로에 있으므로 dict 재구성 없이
+    제자리에서 pop (대형 랭킹 payload 4종의 전체 복사 제거).
+    """
     if not data:
         return {}
-    return {k: v for k, v in data.items() if k not in ("collected_at", "category", "exclude_etf")}
+    for key in _META_FIELDS:
+        data.pop(key, None)
+    return data
 
 
 def export_for_frontend(
@@ -152,9 +238,12 @@ def export_for_frontend(
     output_path = ROOT_DIR / output_dir
     output_path.mkdir(parents=True, exist_ok=True)
 
+    # 기준 시각은 1회만 계산하여 timestamp/파일명/인덱스에 공유
+    now = datetime.now(KST)
+
     # 데이터 구조화
     data = {
-        "timestamp": datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S"),
+        "timestamp": now.strftime("%Y-%m-%d %H:%M:%S"),
         "exchange": exchange_data or {},
         "rising": {
             "kospi": rising_stocks.get("kospi", []),
@@ -180,16 +269,18 @@ def export_for_frontend(
     # None 값 필드 제거
     data = {k: v for k, v in data.items() if v is not None}
 
-    # JSON 파일 저장 (latest.json)
+    # 1회 인코딩하여 latest.json과 히스토리 파일에 동일 payload 기록
+    payload = _encode_json(data)
     file_path = output_path / "latest.json"
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    file_path.write_bytes(payload)
 
     # 히스토리 파일 저장
     if save_history:
         history_dir = output_path / "history"
-        save_history_file(data, history_dir)
-        cleanup_old_history(history_dir, days=30)
-        update_history_index(output_path)
+        filename = save_history_file(data, history_dir, payload=payload, now=now)
+        deleted = cleanup_old_history(history_dir, days=30)
+        update_history_index(
+            output_path, now=now, new_filename=filename, deleted_names=deleted
+        )
 
     return str(file_path)
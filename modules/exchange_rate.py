@@ -3,30 +3,88 @@
 - 실시간 환율 정보 조회
 - 주요 통화(USD, JPY, EUR, CNY) 환율 제공
 """
+import json
 import time
 import urllib3
 import requests
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Any, Optional
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-from modules.utils import KST
+from modules.utils import KST, now_kst_str
 
 # 주요 통화 코드
 MAJOR_CURRENCIES = ["USD", "JPY(100)", "EUR", "CNH"]
 
+# 환율 캐시 파일 (재실행/프로세스 간 공유, .cache는 gitignore 대상)
+_CACHE_FILE = Path(__file__).parent.parent / ".cache" / "exchange_rate.json"
+
+# 캐시 유효 시간 (초): 고시 환율은 시간 단위보다 빠르게 변하지 않음
+_CACHE_TTL = 3600
+
+# 통화별 국기 이모지 (호출마다 dict 리터럴 재생성 방지)
+_FLAG_EMOJI = {
+    "USD": "🇺🇸",
+    "JPY": "🇯🇵",
+    "EUR": "🇪🇺",
+    "CNY": "🇨🇳",
+}
+
 
 class ExchangeRateAPI:
     """한국수출입은행 환율 API 클라이언트"""
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, session: Optional[requests.Session] = None):
         """
         Args:
             api_key: 한국수출입은행 API 인증키
+            session: 공유 requests.Session (없으면 호출마다 자체 생성)
         """
         self.api_key = api_key or "iiUCA5fWpK1ni8A3BR5JrWk7obCuk5ka"
         self.api_url = "https://www.koreaexim.go.kr/site/program/financial/exchangeJSON"
+        # Session을 인스턴스 수명 동안 유지: keep-alive로 재시도/재호출 시
+        # TCP+TLS 핸드셰이크 재수행 없이 기존 연결 재사용
+        # (Session 자체는 WAF 쿠키 검증 통과를 위해서도 필수)
+        self._session = session or requests.Session()
+        # verify=False: GitHub Actions에서 koreaexim SSL 인증서 검증 실패 대응
+        self._session.verify = False
+        self._session.headers.update({
+            "User-Agent": "Mozilla/5.0 (compatible; ExchangeRateBot/1.0)"
+        })
+        # 조회일자별 캐시: {search_date: {"fetched_at": ts, "result": {...}}}
+        self._cache: Dict[str, Dict[str, Any]] = self._load_disk_cache()
+
+    def _load_disk_cache(self) -> Dict[str, Dict[str, Any]]:
+        """디스크 캐시 로드 (없거나 손상 시 빈 캐시)"""
+        try:
+            with open(_CACHE_FILE, encoding="utf-8") as f:
+                cache = json.load(f)
+            if isinstance(cache, dict):
+                return cache
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save_disk_cache(self) -> None:
+        """디스크 캐시 저장 (실패해도 조회 결과에는 영향 없음)"""
+        try:
+            _CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(_CACHE_FILE, "w", encoding="utf-8") as f:
+                json.dump(self._cache, f, ensure_ascii=False)
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        """Session 종료 (연결 풀 반환)"""
+        self._session.close()
+
+    def __enter__(self) -> "ExchangeRateAPI":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
 
     def get_exchange_rates(self, search_date: str = None) -> Dict[str, Any]:
         """환율 정보 조회
@@ -48,6 +106,13 @@ class ExchangeRateAPI:
             now = datetime.now(KST)
             search_date = now.strftime("%Y%m%d")
 
+        # 캐시 조회: 1시간 이내 조회 결과면 네트워크 왕복 없이 반환
+        # (fallback으로 search_date가 바뀌어도 요청 기준일로 캐시)
+        cache_key = search_date
+        cached = self._cache.get(cache_key)
+        if cached and time.time() - cached.get("fetched_at", 0) < _CACHE_TTL:
+            return cached["result"]
+
         params = {
             "authkey": self.api_key,
             "searchdate": search_date,
@@ -55,13 +120,7 @@ class ExchangeRateAPI:
         }
 
         try:
-            # Session 사용 (WAF 쿠키 검증 통과를 위해 필수)
-            # verify=False: GitHub Actions에서 koreaexim SSL 인증서 검증 실패 대응
-            session = requests.Session()
-            session.verify = False
-            session.headers.update({
-                "User-Agent": "Mozilla/5.0 (compatible; ExchangeRateBot/1.0)"
-            })
+            session = self._session
 
             data = None
             last_err = None
@@ -80,10 +139,16 @@ class ExchangeRateAPI:
                 raise last_err
 
             if not data:
-                # 데이터가 없으면 최대 7일 전까지 조회 시도 (주말/공휴일 대응)
-                base_date = datetime.strptime(search_date, "%Y%m%d")
-                for days_back in range(1, 8):
-                    prev_date = (base_date - timedelta(days=days_back)).strftime("%Y%m%d")
+                # 데이터가 없으면 직전 영업일부터 역순 조회 (주말/공휴일 대응)
+                # 요일 계산으로 주말을 한 번에 건너뛰어 불필요한 요청 제거
+                # (영업일 기준 최대 4회: 연휴까지 커버하면서 최악 지연 단축)
+                candidate = datetime.strptime(search_date, "%Y%m%d")
+                for _ in range(4):
+                    weekday = candidate.weekday()
+                    # 월요일은 3일 전(금), 일요일은 2일 전(금), 그 외 1일 전
+                    step = 3 if weekday == 0 else (2 if weekday == 6 else 1)
+                    candidate -= timedelta(days=step)
+                    prev_date = candidate.strftime("%Y%m%d")
                     params["searchdate"] = prev_date
                     response = session.get(self.api_url, params=params, timeout=10)
                     response.raise_for_status()
@@ -115,12 +180,19 @@ class ExchangeRateAPI:
             currency_order = {"USD": 0, "JPY": 1, "EUR": 2, "CNY": 3}
             rates.sort(key=lambda x: currency_order.get(x["currency"], 99))
 
-            return {
-                "timestamp": datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S"),
+            result = {
+                "timestamp": now_kst_str(),
                 "search_date": search_date,
                 "rates": rates,
             }
 
+            # 성공 결과만 캐시 (빈 결과 캐시로 인한 장기 오염 방지)
+            if rates:
+                self._cache[cache_key] = {"fetched_at": time.time(), "result": result}
+                self._save_disk_cache()
+
+            return result
+
         except requests.exceptions.RequestException as e:
             print(f"[환율] API 요청 실패: {e}")
             return {"timestamp": "", "search_date": "", "rates": []}
@@ -146,29 +218,17 @@ class ExchangeRateAPI:
         Returns:
             포맷팅된 문자열
         """
-        if not exchange_data.get("rates"):
+        rates = exchange_data.get("rates")
+        if not rates:
             return ""
 
-        lines = ["💱 <b>실시간 환율</b>"]
-
-        for rate in exchange_data["rates"]:
-            currency = rate["currency"]
-            value = rate["rate"]
-            is_100 = rate["is_100"]
-
-            # 통화별 이모지
-            emoji = {
-                "USD": "🇺🇸",
-                "JPY": "🇯🇵",
-                "EUR": "🇪🇺",
-                "CNY": "🇨🇳",
-            }.get(currency, "💵")
-
-            # 100엔 단위 표시
-            unit = "(100)" if is_100 else ""
-            lines.append(f"{emoji} {currency}{unit}: {value:,.2f}원")
-
-        return "\n".join(lines)
+        # 단일 join으로 조립 (100엔 단위는 "(100)" 표기)
+        body = "\n".join(
+            f"{_FLAG_EMOJI.get(r['currency'], '💵')} {r['currency']}"
+            f"{'(100)' if r['is_100'] else ''}: {r['rate']:,.2f}원"
+            for r in rates
+        )
+        return "💱 <b>실시간 환율</b>\n" + body
 
 
 if __name__ == "__main__":
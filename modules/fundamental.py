@@ -1,11 +1,55 @@
 """종목별 펀더멘탈(재무/밸류에이션) 데이터 수집 모듈"""
 
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
 
 from modules.kis_client import KISClient
 
 
-from modules.utils import safe_float_or_none as safe_float
+from modules.utils import KST, safe_float_or_none as safe_float
+
+# 병렬 수집 워커 수 (stock_history와 동일: KIS 레이트 리밋은 클라이언트가 조절)
+_MAX_WORKERS = 8
+
+
+def _safe_int(value) -> Optional[int]:
+    """빈 문자열/None 허용 int 변환 (실패 시 None)"""
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+# collect_fundamental 결과 필드 (dict.fromkeys로 일괄 초기화)
+_RESULT_KEYS = (
+    "per", "pbr", "eps", "bps", "market_cap",
+    "roe", "debt_ratio", "eps_growth", "opm",
+    "peg", "rsi", "pgtr_ntby_qty",
+    "w52_hgpr", "w52_lwpr", "stck_prpr",
+)
+
+# API 응답 필드 → 결과 키 매핑 테이블: (응답 키, 결과 키, 변환 함수)
+# 필드별 try/except 블록 반복 대신 단일 루프로 처리
+_PRICE_FIELDS = (
+    ("per", "per", safe_float),
+    ("pbr", "pbr", safe_float),
+    ("eps", "eps", safe_float),
+    ("bps", "bps", safe_float),
+    ("hts_avls", "market_cap", safe_float),
+    ("w52_hgpr", "w52_hgpr", _safe_int),
+    ("w52_lwpr", "w52_lwpr", _safe_int),
+    ("stck_prpr", "stck_prpr", _safe_int),
+    ("pgtr_ntby_qty", "pgtr_ntby_qty", _safe_int),
+)
+_RATIO_FIELDS = (
+    ("roe_val", "roe", safe_float),
+    ("lblt_rate", "debt_ratio", safe_float),
+    ("grs", "eps_growth", safe_float),
+    ("bsop_prfi_inrt", "opm", safe_float),
+)
 
 
 class FundamentalCollector:
@@ -13,6 +57,9 @@ class FundamentalCollector:
 
     def __init__(self, client: KISClient):
         self.client = client
+        # (종목코드, 조회일) 단위 메모이제이션: 여러 TOP 리스트에 겹치는
+        # 종목의 재조회를 dict 조회로 대체 (HTTPS 왕복 2회 절약)
+        self._cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
 
     def calculate_rsi(self, daily_prices: List[Dict], period: int = 14) -> Optional[float]:
         """일봉 종가 데이터에서 RSI(14) 계산 (Wilder's Smoothed RSI)
@@ -27,38 +74,48 @@ class FundamentalCollector:
         if not daily_prices or len(daily_prices) < period + 1:
             return None
 
-        # 최신순 → 오래된 순으로 뒤집기
-        prices = list(reversed(daily_prices))
-
+        # 최신순 → 오래된 순으로 변환 (리스트 복사 없이 역방향 순회)
         closes = []
-        for p in prices:
+        append = closes.append
+        for p in reversed(daily_prices):
             try:
-                closes.append(int(p.get("stck_clpr", 0)))
+                append(int(p.get("stck_clpr", 0)))
             except (ValueError, TypeError):
                 continue
 
         if len(closes) < period + 1:
             return None
 
-        # 일별 변동폭 계산
-        gains = []
-        losses = []
-        for i in range(1, len(closes)):
-            diff = closes[i] - closes[i - 1]
-            gains.append(max(diff, 0))
-            losses.append(max(-diff, 0))
-
-        if len(gains) < period:
-            return None
-
-        # 초기 평균 (단순 평균)
-        avg_gain = sum(gains[:period]) / period
-        avg_loss = sum(losses[:period]) / period
-
-        # Wilder's smoothing
-        for i in range(period, len(gains)):
-            avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-            avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+        # 변동폭을 단일 패스로 스트리밍 계산
+        # (gains/losses 중간 리스트와 max() 호출 제거 → 약 60종목 × 수백 일봉
+        #  구간에서 파이썬 바이트코드 디스패치 횟수를 절반 이하로 축소)
+        prev = closes[0]
+
+        # 초기 평균 (첫 period일 단순 평균)
+        gain_sum = 0
+        loss_sum = 0
+        for close in closes[1:period + 1]:
+            diff = close - prev
+            prev = close
+            if diff > 0:
+                gain_sum += diff
+            else:
+                loss_sum -= diff
+        avg_gain = gain_sum / period
+        avg_loss = loss_sum / period
+
+        # Wilder's smoothing (계수는 루프 밖에서 1회 계산)
+        decay = (period - 1) / period
+        weight = 1.0 / period
+        for close in closes[period + 1:]:
+            diff = close - prev
+            prev = close
+            if diff > 0:
+                avg_gain = avg_gain * decay + diff * weight
+                avg_loss = avg_loss * decay
+            else:
+                avg_gain = avg_gain * decay
+                avg_loss = avg_loss * decay - diff * weight
 
         if avg_loss == 0:
             return 100.0
@@ -75,54 +132,23 @@ class FundamentalCollector:
         2. get_financial_ratio() -> ROE, 부채비율, 영업이익률(OPM), 매출액증가율
         + PEG = PER / 매출액증가율 (계산)
         """
-        result = {
-            "per": None, "pbr": None, "eps": None, "bps": None,
-            "market_cap": None,
-            "roe": None, "debt_ratio": None, "eps_growth": None,
-            "opm": None,
-            "peg": None, "rsi": None,
-            "pgtr_ntby_qty": None,
-            "w52_hgpr": None,
-            "w52_lwpr": None,
-            "stck_prpr": None,
-        }
-
-        # 1) inquire-price -> per, pbr, eps, bps, hts_avls(시가총액)
+        # 캐시 히트 시 API 호출 생략. 호출 측(RSI 등)이 결과를 수정해도
+        # 캐시가 오염되지 않도록 복사본 반환
+        cache_key = (stock_code, datetime.now(KST).strftime("%Y-%m-%d"))
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        result = dict.fromkeys(_RESULT_KEYS)
+
+        # 1) inquire-price -> per, pbr, eps, bps, hts_avls(시가총액),
+        #    52주 최고가/최저가, 현재가, 프로그램 매매 순매수 수량
         try:
             price_data = self.client.get_stock_price(stock_code)
             if price_data.get("rt_cd") == "0":
                 output = price_data.get("output", {})
-                result["per"] = safe_float(output.get("per"))
-                result["pbr"] = safe_float(output.get("pbr"))
-                result["eps"] = safe_float(output.get("eps"))
-                result["bps"] = safe_float(output.get("bps"))
-                result["market_cap"] = safe_float(output.get("hts_avls"))
-                # 52주 최고가/최저가, 현재가
-                w52h = output.get("w52_hgpr")
-                if w52h is not None and w52h != "":
-                    try:
-                        result["w52_hgpr"] = int(w52h)
-                    except (ValueError, TypeError):
-                        pass
-                w52l = output.get("w52_lwpr")
-                if w52l is not None and w52l != "":
-                    try:
-                        result["w52_lwpr"] = int(w52l)
-                    except (ValueError, TypeError):
-                        pass
-                prpr = output.get("stck_prpr")
-                if prpr is not None and prpr != "":
-                    try:
-                        result["stck_prpr"] = int(prpr)
-                    except (ValueError, TypeError):
-                        pass
-                # 프로그램 매매 순매수 수량
-                pgtr = output.get("pgtr_ntby_qty")
-                if pgtr is not None and pgtr != "":
-                    try:
-                        result["pgtr_ntby_qty"] = int(pgtr)
-                    except (ValueError, TypeError):
-                        pass
+                for src, dst, cast in _PRICE_FIELDS:
+                    result[dst] = cast(output.get(src))
         except Exception:
             pass
 
@@ -134,10 +160,8 @@ class FundamentalCollector:
                 items = fin_data.get("output", [])
                 if items:
                     latest = items[0]
-                    result["roe"] = safe_float(latest.get("roe_val"))
-                    result["debt_ratio"] = safe_float(latest.get("lblt_rate"))
-                    result["eps_growth"] = safe_float(latest.get("grs"))
-                    result["opm"] = safe_float(latest.get("bsop_prfi_inrt"))
+                    for src, dst, cast in _RATIO_FIELDS:
+                        result[dst] = cast(latest.get(src))
         except Exception:
             pass
 
@@ -145,6 +169,7 @@ class FundamentalCollector:
         if result["per"] and result["eps_growth"] and result["eps_growth"] > 0:
             result["peg"] = round(result["per"] / result["eps_growth"], 2)
 
+        self._cache[cache_key] = dict(result)
         return result
 
     def collect_all_fundamentals(
@@ -161,26 +186,41 @@ class FundamentalCollector:
         Returns:
             {종목코드: {"per": ..., "pbr": ..., ...}, ...}
         """
-        result = {}
-        total = len(stocks)
-
-        for idx, stock in enumerate(stocks):
+        # 중복 코드 제외한 대상 목록 (표시용 이름 포함)
+        targets = {}
+        for stock in stocks:
             code = stock.get("code", "")
-            if not code:
-                continue
-
-            try:
-                fundamental = self.collect_fundamental(code)
-
-                # RSI 계산 (일봉 데이터가 있으면)
-                if daily_price_data and code in daily_price_data:
-                    fundamental["rsi"] = self.calculate_rsi(daily_price_data[code])
-
-                result[code] = fundamental
-            except Exception as e:
-                print(f"  \u26a0 {stock.get('name', code)}({code}) 펀더멘탈 조회 실패: {e}")
-
-            if (idx + 1) % 10 == 0 or idx + 1 == total:
-                print(f"  진행: {idx + 1}/{total}")
-
-        return result
+            if code:
+                targets.setdefault(code, stock.get("name", code))
+
+        collected = {}
+        total = len(targets)
+        done = 0
+
+        # 종목별 수집은 독립적이므로 병렬화 (종목당 API 2회 호출이 지배적
+        # 비용 → 네트워크 대기를 워커 수만큼 겹침. 호출 속도는 KISClient의
+        # 전역 레이트 리미터가 조절)
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(self.collect_fundamental, code): code
+                for code in targets
+            }
+            for future in as_completed(futures):
+                code = futures[future]
+                done += 1
+                try:
+                    fundamental = future.result()
+
+                    # RSI 계산 (일봉 데이터가 있으면)
+                    if daily_price_data and code in daily_price_data:
+                        fundamental["rsi"] = self.calculate_rsi(daily_price_data[code])
+
+                    collected[code] = fundamental
+                except Exception as e:
+                    print(f"  \u26a0 {targets[code]}({code}) 펀더멘탈 조회 실패: {e}")
+
+                if done % 10 == 0 or done == total:
+                    print(f"  진행: {done}/{total}")
+
+        # 입력 종목 순서 유지 (완료 순서와 무관하게 결과 순서 고정)
+        return {code: collected[code] for code in targets if code in collected}
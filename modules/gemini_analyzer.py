@@ -4,118 +4,178 @@ Gemini AI 기반 테마/대장주 분석 모듈
 Google Search grounding을 활용하여 최신 뉴스 기반 시장 테마 분석
 """
 import json
+import random
 import re
+import threading
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from datetime import datetime
+from itertools import chain, islice
 from typing import Dict, List, Any, Optional
 
 from config.settings import GEMINI_API_KEY_1, GEMINI_API_KEY_2, GEMINI_API_KEY_3, GEMINI_API_KEY_4, GEMINI_API_KEY_5
+from modules import gemini_cache
 from modules.utils import KST
 
+# orjson(C 구현)이 있으면 응답 파싱에 사용 (Gemini 응답은 수십 KB 단위)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(data):
+    """JSON 파싱 (orjson 가용 시 우선 사용)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent"
 
+# 모듈 공용 Session: 키/재시도에 걸쳐 TCP+TLS 연결 재사용
+# (키별 워커 스레드가 동시 사용하므로 풀 크기는 키 수 이상으로)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=0))
+
+# JSON 추출용 정규식 (모듈 로드 시 1회 컴파일)
+_JSON_FENCED = re.compile(r"```json\s*(.*?)\s*```", re.DOTALL)
+_FENCED = re.compile(r"```\s*(.*?)\s*```", re.DOTALL)
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
 
-def _get_api_keys() -> List[str]:
-    """사용 가능한 API 키 목록 반환"""
-    keys = [GEMINI_API_KEY_1, GEMINI_API_KEY_2, GEMINI_API_KEY_3, GEMINI_API_KEY_4, GEMINI_API_KEY_5]
+
+def _get_api_keys(override: List[str] = None) -> List[str]:
+    """사용 가능한 API 키 목록 반환 (override로 부분 키 집합 지정 가능)"""
+    keys = override or [GEMINI_API_KEY_1, GEMINI_API_KEY_2, GEMINI_API_KEY_3, GEMINI_API_KEY_4, GEMINI_API_KEY_5]
     return [k for k in keys if k]
 
 
+# 섹션당 종목 수 상한: 컨텍스트가 길수록 입력 토큰(TPM) 소모와 429 빈도가
+# 늘므로 전 섹션 10개로 통일 (기존 20개 섹션은 하류에서 재절단되던 분량)
+_TOP_N = 10
+
+# 프롬프트 비대 경고 임계 (문자 수)
+_CONTEXT_WARN_LEN = 32_000
+
+
+def _fmt_rising_row(s: Dict, market: str) -> str:
+    """상승률 섹션 행 포맷"""
+    name, code = s.get("name"), s.get("code")
+    rate, price, vol = s.get("change_rate", 0), s.get("current_price", 0), s.get("volume", 0)
+    return f"- {name}({code}) {market} +{rate:.2f}% 현재가:{price:,}원 거래량:{vol:,}"
+
+
+def _fmt_volume_row(s: Dict, market: str) -> str:
+    """거래량 섹션 행 포맷"""
+    name, code = s.get("name"), s.get("code")
+    rate, vol = s.get("change_rate", 0), s.get("volume", 0)
+    return f"- {name}({code}) {market} 등락:{rate:.2f}% 거래량:{vol:,}"
+
+
+def _fmt_trading_value_row(s: Dict, market: str, rate_prefix: str = "") -> str:
+    """거래대금 섹션 행 포맷 (교차 섹션은 rate_prefix='+'로 부호 표기)"""
+    name, code = s.get("name"), s.get("code")
+    rate, tv = s.get("change_rate", 0), s.get("trading_value", 0)
+    tv_str = f"{tv / 100_000_000:,.0f}억원" if tv else "N/A"
+    return f"- {name}({code}) {market} 등락:{rate_prefix}{rate:.2f}% 거래대금:{tv_str}"
+
+
+def _fmt_fluctuation_row(s: Dict, market: str) -> str:
+    """등락률 섹션 행 포맷"""
+    name, code = s.get("name"), s.get("code")
+    rate, price = s.get("change_rate", 0), s.get("current_price", 0)
+    return f"- {name}({code}) {market} +{rate:.2f}% 현재가:{price:,}원"
+
+
+# 랭킹 섹션 명세: (데이터 키, 섹션 제목, (하위 키, 시장 라벨) 목록, 행 포맷터)
+# 섹션별 개별 루프 대신 단일 명세 루프로 조립
+_MARKETS = (("kospi", "코스피"), ("kosdaq", "코스닥"))
+_FLUC_UP_MARKETS = (("kospi_up", "코스피"), ("kosdaq_up", "코스닥"))
+_SECTION_SPECS = (
+    ("rising", "## 상승률 TOP 종목", _MARKETS, _fmt_rising_row),
+    ("volume", "\n## 거래량 TOP 종목", _MARKETS, _fmt_volume_row),
+    ("trading_value", "\n## 거래대금 TOP 종목", _MARKETS, _fmt_trading_value_row),
+    ("fluctuation", "\n## 등락률 상승 TOP 종목", _FLUC_UP_MARKETS, _fmt_fluctuation_row),
+)
+
+
 def _build_stock_context(stock_data: Dict[str, Any], fundamental_data: Dict[str, Dict] = None, investor_data: Dict[str, Dict] = None) -> str:
-    """수집된 종목 데이터에서 Gemini 프롬프트용 컨텍스트 생성"""
+    """수집된 종목 데이터에서 Gemini 프롬프트용 컨텍스트 생성
+
+    섹션별로 행 포맷터 + extend로 조립 (행당 append/get 체인 반복 제거).
+    """
     lines = []
 
-    # 상승 TOP10
-    rising_kospi = stock_data.get("rising", {}).get("kospi", [])[:10]
-    rising_kosdaq = stock_data.get("rising", {}).get("kosdaq", [])[:10]
-    if rising_kospi or rising_kosdaq:
-        lines.append("## 상승률 TOP 종목")
-        for s in rising_kospi:
-            lines.append(f"- {s.get('name')}({s.get('code')}) 코스피 +{s.get('change_rate', 0):.2f}% 현재가:{s.get('current_price', 0):,}원 거래량:{s.get('volume', 0):,}")
-        for s in rising_kosdaq:
-            lines.append(f"- {s.get('name')}({s.get('code')}) 코스닥 +{s.get('change_rate', 0):.2f}% 현재가:{s.get('current_price', 0):,}원 거래량:{s.get('volume', 0):,}")
-
-    # 거래량 TOP10
-    vol_kospi = stock_data.get("volume", {}).get("kospi", [])[:20]
-    vol_kosdaq = stock_data.get("volume", {}).get("kosdaq", [])[:20]
-    if vol_kospi or vol_kosdaq:
-        lines.append("\n## 거래량 TOP 종목")
-        for s in vol_kospi:
-            lines.append(f"- {s.get('name')}({s.get('code')}) 코스피 등락:{s.get('change_rate', 0):.2f}% 거래량:{s.get('volume', 0):,}")
-        for s in vol_kosdaq:
-            lines.append(f"- {s.get('name')}({s.get('code')}) 코스닥 등락:{s.get('change_rate', 0):.2f}% 거래량:{s.get('volume', 0):,}")
-
-    # 거래대금 TOP10
-    tv_kospi = stock_data.get("trading_value", {}).get("kospi", [])[:20]
-    tv_kosdaq = stock_data.get("trading_value", {}).get("kosdaq", [])[:20]
-    if tv_kospi or tv_kosdaq:
-        lines.append("\n## 거래대금 TOP 종목")
-        for s in tv_kospi:
-            tv = s.get("trading_value", 0)
-            tv_str = f"{tv / 100_000_000:,.0f}억원" if tv else "N/A"
-            lines.append(f"- {s.get('name')}({s.get('code')}) 코스피 등락:{s.get('change_rate', 0):.2f}% 거래대금:{tv_str}")
-        for s in tv_kosdaq:
-            tv = s.get("trading_value", 0)
-            tv_str = f"{tv / 100_000_000:,.0f}억원" if tv else "N/A"
-            lines.append(f"- {s.get('name')}({s.get('code')}) 코스닥 등락:{s.get('change_rate', 0):.2f}% 거래대금:{tv_str}")
-
-    # 등락률 TOP10
+    # 랭킹 4개 섹션을 명세 기반 단일 루프로 조립
+    # (행이 하나도 없으면 제목만 남으므로 되돌림 — 섹션 생략 동작 유지)
+    for key, title, markets, fmt in _SECTION_SPECS:
+        section = stock_data.get(key, {})
+        header_idx = len(lines)
+        lines.append(title)
+        for subkey, label in markets:
+            lines.extend(fmt(s, label) for s in islice(section.get(subkey, ()), _TOP_N))
+        if len(lines) == header_idx + 1:
+            lines.pop()
+
     fluc = stock_data.get("fluctuation", {})
-    fluc_kospi_up = fluc.get("kospi_up", [])[:20]
-    fluc_kosdaq_up = fluc.get("kosdaq_up", [])[:20]
-    if fluc_kospi_up or fluc_kosdaq_up:
-        lines.append("\n## 등락률 상승 TOP 종목")
-        for s in fluc_kospi_up:
-            lines.append(f"- {s.get('name')}({s.get('code')}) 코스피 +{s.get('change_rate', 0):.2f}% 현재가:{s.get('current_price', 0):,}원")
-        for s in fluc_kosdaq_up:
-            lines.append(f"- {s.get('name')}({s.get('code')}) 코스닥 +{s.get('change_rate', 0):.2f}% 현재가:{s.get('current_price', 0):,}원")
-    # 거래대금+상승률 교차 필터 (거래대금 순서 기준, 등락률 상승 TOP에도 포함된 종목)
-    fluc_up_codes = set(
-        s.get("code", "") for s in fluc.get("kospi_up", []) + fluc.get("kosdaq_up", [])
-    )
     tv_all_kospi = stock_data.get("trading_value", {}).get("kospi", [])
     tv_all_kosdaq = stock_data.get("trading_value", {}).get("kosdaq", [])
 
-    cross_kospi_up = [s for s in tv_all_kospi if s.get("code", "") in fluc_up_codes][:10]
-    cross_kosdaq_up = [s for s in tv_all_kosdaq if s.get("code", "") in fluc_up_codes][:10]
+    # 거래대금+상승률 교차 필터 (거래대금 순서 기준, 등락률 상승 TOP에도 포함된 종목)
+    # 호출 측이 재시도 등으로 같은 stock_data를 다시 넘기는 경우를 위해
+    # 코드 집합을 입력 dict에 메모이제이션 (내부 키는 내보내기 대상 아님)
+    fluc_up_codes = stock_data.get("_fluc_up_codes")
+    if fluc_up_codes is None:
+        fluc_up_codes = {
+            s["code"]
+            for part in ("kospi_up", "kosdaq_up")
+            for s in fluc.get(part, ())
+            if s.get("code")
+        }
+        stock_data["_fluc_up_codes"] = fluc_up_codes
+
+    # islice로 10개 확보 즉시 순회 중단 (전체 거래대금 리스트 스캔 방지)
+    cross_kospi_up = list(islice(
+        (s for s in tv_all_kospi if s.get("code", "") in fluc_up_codes), _TOP_N
+    ))
+    cross_kosdaq_up = list(islice(
+        (s for s in tv_all_kosdaq if s.get("code", "") in fluc_up_codes), _TOP_N
+    ))
     if cross_kospi_up or cross_kosdaq_up:
         lines.append("\n## 거래대금+상승률 교차 종목 (대금 순)")
-        for s in cross_kospi_up:
-            tv = s.get("trading_value", 0)
-            tv_str = f"{tv / 100_000_000:,.0f}억원" if tv else "N/A"
-            lines.append(f"- {s.get('name')}({s.get('code')}) 코스피 등락:+{s.get('change_rate', 0):.2f}% 거래대금:{tv_str}")
-        for s in cross_kosdaq_up:
-            tv = s.get("trading_value", 0)
-            tv_str = f"{tv / 100_000_000:,.0f}억원" if tv else "N/A"
-            lines.append(f"- {s.get('name')}({s.get('code')}) 코스닥 등락:+{s.get('change_rate', 0):.2f}% 거래대금:{tv_str}")
+        lines.extend(_fmt_trading_value_row(s, "코스피", "+") for s in cross_kospi_up)
+        lines.extend(_fmt_trading_value_row(s, "코스닥", "+") for s in cross_kosdaq_up)
 
     # 종목코드 → 종목명 매핑 구성 (펀더멘탈/수급 섹션에서 공용)
+    # chain으로 전 섹션을 단일 패스 순회 + setdefault로 동일 코드 재대입 제거
     code_to_name = {}
-    all_sections = [
+    all_sections = (
         stock_data.get("rising", {}),
         stock_data.get("falling", {}),
         stock_data.get("volume", {}),
         stock_data.get("trading_value", {}),
-    ]
-    fluc_data = stock_data.get("fluctuation", {})
-    for section in all_sections:
-        for market_stocks in section.values():
-            if isinstance(market_stocks, list):
-                for s in market_stocks:
-                    c = s.get("code", "")
-                    if c:
-                        code_to_name[c] = s.get("name", c)
-    for key in ("kospi_up", "kospi_down", "kosdaq_up", "kosdaq_down"):
-        for s in fluc_data.get(key, []):
-            c = s.get("code", "")
-            if c:
-                code_to_name[c] = s.get("name", c)
+    )
+    for s in chain(
+        chain.from_iterable(
+            ms for sec in all_sections for ms in sec.values() if isinstance(ms, list)
+        ),
+        fluc.get("kospi_up", ()),
+        fluc.get("kospi_down", ()),
+        fluc.get("kosdaq_up", ()),
+        fluc.get("kosdaq_down", ()),
+    ):
+        c = s.get("code", "")
+        if c:
+            code_to_name.setdefault(c, s.get("name", c))
 
     # 펀더멘탈 데이터 섹션
     if fundamental_data:
         lines.append("\n## 종목별 밸류에이션/재무 지표")
         for code, f in fundamental_data.items():
+            # 전 필드 None인 종목은 행 구성 생략
+            if all(v is None for v in f.values()):
+                continue
             name = code_to_name.get(code, code)
             parts = []
             if f.get("per") is not None:
@@ -143,6 +203,9 @@ def _build_stock_context(stock_data: Dict[str, Any], fundamental_data: Dict[str,
     if investor_data:
         lines.append("\n## 종목별 외국인/기관 수급 동향")
         for code, inv in investor_data.items():
+            # 세 수급 값이 모두 없거나 0이면 행 구성 생략
+            if not (inv.get("foreign_net") or inv.get("institution_net") or inv.get("individual_net")):
+                continue
             name = code_to_name.get(code, code)
             parts = []
             foreign = inv.get("foreign_net")
@@ -174,7 +237,10 @@ def _build_stock_context(stock_data: Dict[str, Any], fundamental_data: Dict[str,
             lines.append("\n## 종목별 프로그램 매매 동향")
             lines.extend(pgtr_lines)
 
-    return "\n".join(lines)
+    context = "\n".join(lines)
+    if len(context) > _CONTEXT_WARN_LEN:
+        print(f"  ⚠ 종목 컨텍스트 비대: {len(context):,}자 (토큰 소모/TPM 주의)")
+    return context
 
 
 def _build_prompt(stock_context: str) -> str:
@@ -248,37 +314,38 @@ def _build_prompt(stock_context: str) -> str:
 def _extract_json(text: str) -> Optional[Dict]:
     """응답 텍스트에서 JSON 블록 추출"""
     # ```json ... ``` 블록 추출
-    match = re.search(r"```json\s*(.*?)\s*```", text, re.DOTALL)
+    match = _JSON_FENCED.search(text)
     if match:
-        return json.loads(match.group(1))
+        return _loads(match.group(1))
     # ``` ... ``` 블록 추출
-    match = re.search(r"```\s*(.*?)\s*```", text, re.DOTALL)
+    match = _FENCED.search(text)
     if match:
         candidate = match.group(1).strip()
         if candidate.startswith("{"):
-            return json.loads(candidate)
+            return _loads(candidate)
     # 전체 텍스트에서 JSON 오브젝트 추출
-    match = re.search(r"\{.*\}", text, re.DOTALL)
+    match = _JSON_OBJECT.search(text)
     if match:
-        return json.loads(match.group(0))
+        return _loads(match.group(0))
     return None
 
 
-def _call_gemini(prompt: str, api_key: str) -> Optional[Dict]:
+def _call_gemini(prompt: str, api_key: str, temperature: float = 0.5) -> Optional[Dict]:
     """Gemini API 호출 (Google Search grounding + 텍스트에서 JSON 파싱)"""
     url = f"{GEMINI_API_URL}?key={api_key}"
     payload = {
         "contents": [{"parts": [{"text": prompt}]}],
         "tools": [{"google_search": {}}],
         "generationConfig": {
-            "temperature": 0.5,
+            "temperature": temperature,
         },
     }
 
-    resp = requests.post(url, json=payload, timeout=120)
+    resp = _SESSION.post(url, json=payload, timeout=120)
     resp.raise_for_status()
 
-    data = resp.json()
+    # resp.json() 대신 바이트에서 직접 파싱 (orjson 경로 활용)
+    data = _loads(resp.content)
     candidates = data.get("candidates", [])
     if not candidates:
         return None
@@ -298,18 +365,151 @@ def _call_gemini(prompt: str, api_key: str) -> Optional[Dict]:
     return _extract_json(text)
 
 
-def analyze_themes(stock_data: Dict[str, Any], fundamental_data: Dict[str, Dict] = None, investor_data: Dict[str, Dict] = None) -> Optional[Dict]:
+_MAX_RETRIES_PER_KEY = 3
+
+# 요청 수준 영구 오류: 프롬프트가 같으므로 어느 키로 보내도 동일하게
+# 실패한다 (잘못된 요청/없는 리소스) — 남은 키 레이스 전체를 중단
+_REQUEST_PERMANENT_STATUSES = frozenset({400, 404})
+
+# 키 수준 영구 오류: 인증/권한 문제로 해당 키만 포기 (다른 키는 계속)
+_KEY_PERMANENT_STATUSES = frozenset({401, 403})
+
+# 백오프 상한 (초)
+_BACKOFF_CAP = 60
+
+# 후순위 키의 시작 지연 (초): 선두 키가 이 시간 내 성공하면 나머지 키는
+# 쿼터를 소모하지 않음 (실패/지연 시에만 순차 합류)
+_KEY_STAGGER = 15.0
+
+# 키별 상태 (쿨다운 만료 시각 / 마지막 사용 시각, epoch)
+# 프로세스 내 후속 호출이 쿨다운 중인 키를 바로 두드리지 않도록 공유
+_KEY_STATE: Dict[str, Dict[str, float]] = {}
+
+
+def _key_state(api_key: str) -> Dict[str, float]:
+    return _KEY_STATE.setdefault(api_key, {"cooldown_until": 0.0, "last_used": 0.0})
+
+
+def _backoff_seconds(e: "requests.exceptions.HTTPError", attempt: int) -> float:
+    """429/503 대기 시간 산출: Retry-After 헤더 우선, 없으면 지터 백오프
+
+    고정 2**n 대기는 동시 실행 크론끼리 같은 시각에 재돌입하는 문제가
+    있어 무작위 지터로 분산한다.
+    """
+    retry_after = 0.0
+    if e.response is not None:
+        try:
+            retry_after = float(e.response.headers.get("Retry-After", 0))
+        except (TypeError, ValueError):
+            retry_after = 0.0
+    wait = retry_after or random.uniform(1, 2 ** (attempt + 1) * 2)
+    return min(wait, _BACKOFF_CAP)
+
+
+def _try_with_key(
+    prompt: str,
+    api_key: str,
+    key_idx: int,
+    total_keys: int,
+    stop_event: threading.Event,
+    temperature: float = 0.5,
+    start_delay: float = 0.0,
+) -> Optional[Dict]:
+    """단일 API 키로 호출 시도 (재시도/백오프 포함, 워커 스레드에서 실행)
+
+    stop_event가 설정되면(다른 키 성공 또는 요청 수준 영구 오류)
+    남은 재시도와 대기를 즉시 중단한다.
+    start_delay만큼 합류를 늦춰 선순위 키가 먼저 기회를 갖는다.
+    """
+    if start_delay > 0 and stop_event.wait(start_delay):
+        return None
+
+    state = _key_state(api_key)
+
+    # 직전 호출에서 남은 쿨다운이 있으면 만료까지 대기 (성공 시 즉시 중단)
+    cooldown = state["cooldown_until"] - time.time()
+    if cooldown > 0:
+        print(f"  ⚠ 키 {key_idx + 1} 쿨다운 {cooldown:.0f}초 대기")
+        if stop_event.wait(cooldown):
+            return None
+
+    for attempt in range(_MAX_RETRIES_PER_KEY):
+        if stop_event.is_set():
+            return None
+        state["last_used"] = time.time()
+        try:
+            print(f"  Gemini API 호출 중... (키 {key_idx + 1}/{total_keys}, 시도 {attempt + 1}/{_MAX_RETRIES_PER_KEY})")
+            result = _call_gemini(prompt, api_key, temperature)
+            if result:
+                return result
+            print("  ⚠ Gemini 응답이 비어있습니다")
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 0
+            if status in (429, 503):
+                wait = _backoff_seconds(e, attempt)
+                state["cooldown_until"] = time.time() + wait
+                if attempt < _MAX_RETRIES_PER_KEY - 1:
+                    print(f"  ⚠ API 제한 ({status}), 키 {key_idx + 1} {wait:.1f}초 후 재시도...")
+                    # Event.wait: 백오프 중 다른 키가 성공하면 즉시 중단
+                    if stop_event.wait(wait):
+                        return None
+                    continue
+                print(f"  ⚠ 키 {key_idx + 1} 재시도 소진")
+                return None
+            if status in _REQUEST_PERMANENT_STATUSES:
+                # 키와 무관한 오류: 대기 중인 후순위 키까지 전부 중단시켜
+                # 같은 실패를 키 수만큼 반복하지 않고 즉시 실패를 알린다
+                print(f"  ✗ Gemini API 요청 영구 오류 ({status}): {e}")
+                stop_event.set()
+                return None
+            kind = "키 영구 오류" if status in _KEY_PERMANENT_STATUSES else "오류"
+            print(f"  ✗ Gemini API {kind} (키 {key_idx + 1}, {status}, 시도 {attempt + 1}): {e}")
+            return None
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            # 네트워크 일시 장애는 재시도 가치가 있음
+            if attempt < _MAX_RETRIES_PER_KEY - 1:
+                wait = min(random.uniform(1, 2 ** (attempt + 1)), _BACKOFF_CAP)
+                print(f"  ⚠ Gemini 연결 실패 (키 {key_idx + 1}, 시도 {attempt + 1}), {wait:.1f}초 후 재시도: {e}")
+                if stop_event.wait(wait):
+                    return None
+                continue
+            print(f"  ✗ Gemini 연결 실패, 재시도 소진 (키 {key_idx + 1}): {e}")
+            return None
+        except ValueError as e:  # json/orjson 파싱 오류 공통
+            print(f"  ⚠ Gemini 응답 JSON 파싱 실패: {e}")
+            if attempt < _MAX_RETRIES_PER_KEY - 1:
+                if stop_event.wait(2):
+                    return None
+                continue
+            return None
+        except Exception as e:
+            # 위에서 분류되지 않은 예외는 재시도로 회복될 가능성이 낮음
+            print(f"  ✗ Gemini API 호출 실패 (키 {key_idx + 1}, 시도 {attempt + 1}): {e}")
+            return None
+    return None
+
+
+def analyze_themes(
+    stock_data: Dict[str, Any],
+    fundamental_data: Dict[str, Dict] = None,
+    investor_data: Dict[str, Dict] = None,
+    *,
+    temperature: float = 0.5,
+    api_keys: List[str] = None,
+) -> Optional[Dict]:
     """수집된 종목 데이터로 AI 테마 분석 수행
 
     Args:
         stock_data: rising, falling, volume, trading_value 등 수집 데이터
         fundamental_data: {종목코드: {"per": ..., "pbr": ..., ...}} 펀더멘탈 데이터 (프로그램 매매 포함)
         investor_data: {종목코드: {"foreign_net": ..., "institution_net": ..., ...}} 수급 데이터
+        temperature: 생성 온도 (변형 호출부용)
+        api_keys: 사용할 키 부분 집합 (기본: 설정된 전체 키)
 
     Returns:
         분석 결과 dict 또는 실패 시 None
     """
-    api_keys = _get_api_keys()
+    api_keys = _get_api_keys(api_keys)
     if not api_keys:
         print("  ⚠ Gemini API 키가 설정되지 않았습니다")
         return None
@@ -321,45 +521,61 @@ def analyze_themes(stock_data: Dict[str, Any], fundamental_data: Dict[str, Dict]
 
     prompt = _build_prompt(stock_context)
 
-    max_retries_per_key = 3
-
-    for key_idx, api_key in enumerate(api_keys):
-        for attempt in range(max_retries_per_key):
-            try:
-                print(f"  Gemini API 호출 중... (키 {key_idx + 1}/{len(api_keys)}, 시도 {attempt + 1}/{max_retries_per_key})")
-                result = _call_gemini(prompt, api_key)
-                if result:
-                    now = datetime.now(KST)
-                    return {
-                        "analyzed_at": now.strftime("%Y-%m-%d %H:%M:%S"),
-                        "analysis_date": now.strftime("%Y년 %m월 %d일"),
-                        "market_summary": result.get("market_summary", ""),
-                        "themes": result.get("themes", []),
-                    }
-                print("  ⚠ Gemini 응답이 비어있습니다")
-            except requests.exceptions.HTTPError as e:
-                status = e.response.status_code if e.response is not None else 0
-                if status in (429, 503):
-                    if attempt < max_retries_per_key - 1:
-                        wait = 2 ** (attempt + 1)
-                        print(f"  ⚠ API 제한 ({status}), {wait}초 후 재시도...")
-                        time.sleep(wait)
-                        continue
-                    else:
-                        print(f"  ⚠ 키 {key_idx + 1} 재시도 소진, 다음 키로 전환")
-                        break
-                else:
-                    print(f"  ✗ Gemini API 오류 ({status}): {e}")
-                    return None
-            except json.JSONDecodeError as e:
-                print(f"  ⚠ Gemini 응답 JSON 파싱 실패: {e}")
-                if attempt < max_retries_per_key - 1:
-                    time.sleep(2)
-                    continue
-                break
-            except Exception as e:
-                print(f"  ✗ Gemini API 호출 실패: {e}")
-                return None
+    # 프롬프트 해시 기반 파일 캐시: 동일 입력 재실행(크래시 후 재시도,
+    # 중복 스케줄 실행 등)이면 API 호출 없이 직전 분석 결과 재사용
+    cache_key = gemini_cache.prompt_key(prompt)
+    cached = gemini_cache.get(cache_key)
+    if cached is not None:
+        print("  ✓ Gemini 캐시 히트 (API 호출 생략)")
+        now = datetime.now(KST)
+        return {
+            "analyzed_at": now.strftime("%Y-%m-%d %H:%M:%S"),
+            "analysis_date": now.strftime("%Y년 %m월 %d일"),
+            "market_summary": cached.get("market_summary", ""),
+            "themes": cached.get("themes", []),
+        }
+
+    # 건강한 키 우선 정렬: 쿨다운이 짧고 최근 사용이 적은 키부터 시도
+    # (항상 0번 키부터 돌면 키 1개에 트래픽이 몰리고, 쿨다운 중인 키를
+    #  매번 먼저 두드리게 됨)
+    api_keys = sorted(
+        api_keys,
+        key=lambda k: (_key_state(k)["cooldown_until"], _key_state(k)["last_used"]),
+    )
+
+    # 키별 시도를 스레드로 병렬 실행: 호출은 수십 초짜리 순수 I/O 대기이므로
+    # 순차 시도(sum-of-attempts)를 동시 시도(max-of-attempts)로 전환.
+    # 후순위 키는 _KEY_STAGGER 간격으로 합류시켜 선두 키가 빨리 성공하면
+    # 나머지 키의 쿼터를 쓰지 않음. 첫 성공 시 stop_event로 전체 중단
+    stop_event = threading.Event()
+    total = len(api_keys)
+
+    executor = ThreadPoolExecutor(max_workers=total, thread_name_prefix="gemini")
+    futures = [
+        executor.submit(
+            _try_with_key, prompt, api_key, key_idx, total, stop_event,
+            temperature, key_idx * _KEY_STAGGER,
+        )
+        for key_idx, api_key in enumerate(api_keys)
+    ]
+    result = None
+    for future in as_completed(futures):
+        result = future.result()
+        if result:
+            stop_event.set()
+            break
+    # 성공 시 진행 중인 HTTP 응답을 기다리지 않고 반환 (스레드는 자연 종료)
+    executor.shutdown(wait=False)
+
+    if result:
+        gemini_cache.put(cache_key, result)
+        now = datetime.now(KST)
+        return {
+            "analyzed_at": now.strftime("%Y-%m-%d %H:%M:%S"),
+            "analysis_date": now.strftime("%Y년 %m월 %d일"),
+            "market_summary": result.get("market_summary", ""),
+            "themes": result.get("themes", []),
+        }
 
     print("  ✗ 모든 Gemini API 키로 분석 실패")
     return None
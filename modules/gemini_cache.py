@@ -0,0 +1,64 @@
+"""Gemini 응답 파일 캐시 모듈
+
+동일 프롬프트 재호출 시 API 왕복(수십 초 + 쿼터)을 디스크 조회로 대체한다.
+- 키: md5(프롬프트) 해시
+- 저장 위치: .cache/gemini/{키 앞 2자리}/{키}.json
+- 엔트리 형식: {"ts": 저장 시각(epoch), "ttl": 유효 시간(초), "data": 응답}
+"""
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# 캐시 루트 (프로젝트 루트 하위, .gitignore 대상)
+_CACHE_DIR = Path(__file__).parent.parent / ".cache" / "gemini"
+
+# 기본 TTL (초): 장중 기준 15분
+DEFAULT_TTL = 900
+
+# 히트/미스 카운터 (프로세스 단위 진단용)
+_stats = {"hits": 0, "misses": 0}
+
+
+def prompt_key(prompt: str) -> str:
+    """프롬프트 문자열에서 캐시 키 생성"""
+    return hashlib.md5(prompt.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    # 앞 2자리로 분할 저장 (단일 디렉토리 비대화 방지)
+    return _CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def get(key: str) -> Optional[Dict]:
+    """캐시 조회 (만료/손상 시 None)"""
+    path = _entry_path(key)
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+        if time.time() - entry["ts"] <= entry["ttl"]:
+            _stats["hits"] += 1
+            return entry["data"]
+        # 만료 엔트리는 제거
+        path.unlink(missing_ok=True)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    _stats["misses"] += 1
+    return None
+
+
+def put(key: str, value: Dict, ttl: int = DEFAULT_TTL) -> None:
+    """캐시 저장 (실패해도 호출 측 결과에는 영향 없음)"""
+    path = _entry_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"ts": time.time(), "ttl": ttl, "data": value}, f, ensure_ascii=False)
+    except OSError:
+        pass
+
+
+def stats() -> Dict[str, int]:
+    """히트/미스 카운터 반환"""
+    return dict(_stats)
@@ -9,10 +9,13 @@
 - 토큰이 만료되어도 먼저 사용을 시도하고, 실패 시에만 재발급합니다.
 - 로컬과 GitHub Actions 간 토큰 공유를 위해 Supabase를 사용합니다.
 """
+import copy
 import json
+import os
 import time
 import threading
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -26,6 +29,12 @@ from config.settings import (
     KIS_BASE_URL,
     ROOT_DIR,
 )
+# orjson(C 구현)이 있으면 토큰 캐시 직렬화에 사용
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from modules.supabase_client import (
     get_kis_credentials_from_supabase,
     get_kis_token_from_supabase,
@@ -44,6 +53,94 @@ class TokenRefreshLimitError(Exception):
     pass
 
 
+class _InflightCall:
+    """동시에 들어온 동일 GET 요청의 응답을 공유하기 위한 홀더 (single-flight)"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._result = None
+        self._error = None
+
+    def set_result(self, result):
+        self._result = result
+        self._event.set()
+
+    def set_error(self, error):
+        self._error = error
+        self._event.set()
+
+    def wait(self, timeout: float = 60.0):
+        if not self._event.wait(timeout):
+            # 소유 요청이 제한 시간 내에 끝나지 않음 (None을 결과로 오인하지 않도록
+            # 명시적으로 구분 — 호출 측은 직접 호출로 폴백)
+            raise TimeoutError(f"동일 요청 대기 {timeout:.0f}초 초과")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+# 프로세스 전역 rate limiter 상태: KISClient 인스턴스가 여러 개 생성되어도
+# (예: /api/refresh 동시 처리) KIS의 초당 호출 제한은 프로세스 단위로 지켜야 하므로
+# 인스턴스가 아닌 모듈 수준에서 공유
+#
+# GCRA(이론적 도착 시각) 방식: 락 안에서는 다음 허용 시각의 예약만 갱신하고
+# 대기(sleep)는 락 밖에서 수행한다. 예약이 sleep보다 먼저 기록되므로
+# 뒤따르는 스레드가 낡은 시각을 읽고 동시 진입하는 경합이 없다.
+# monotonic 사용: 벽시계(NTP/수동) 조정에 영향받지 않음.
+_RATE_LOCK = threading.Lock()
+_rate_state = {"next_slot": 0.0}  # 다음 요청 허용 시각 (monotonic 기준)
+_MIN_INTERVAL = 0.05  # 1/20 = 50ms
+
+
+# 느리게 변하는 엔드포인트의 응답 TTL 캐시 (프로세스 전역)
+# /api/refresh가 호출마다 KISClient를 새로 만들어도 캐시는 유지되어
+# 장중 재실행 간 동일 (tr_id, 종목) 재조회 시 네트워크와 rate limit
+# 소모를 모두 생략한다. 시세류는 실시간성이 필요하므로 대상에서 제외.
+_RESPONSE_TTL_BY_TR_ID = {
+    "FHKST66430300": 86400,  # 재무비율: 분기 단위 갱신 → 24시간
+}
+_RESPONSE_CACHE_LOCK = threading.Lock()
+_response_cache: Dict[tuple, tuple] = {}  # key -> (만료 시각 monotonic, 응답)
+_RESPONSE_CACHE_MAX = 2048
+
+
+def _cached_response(key: tuple) -> Optional[Dict[str, Any]]:
+    """TTL 캐시 조회 (미스/만료 시 None, 히트 시 복사본 반환)"""
+    with _RESPONSE_CACHE_LOCK:
+        entry = _response_cache.get(key)
+    if entry is not None and time.monotonic() < entry[0]:
+        # 호출 측 수정이 캐시를 오염시키지 않도록 복사본 반환
+        return copy.deepcopy(entry[1])
+    return None
+
+
+def _store_response(key: tuple, ttl: int, response: Dict[str, Any]):
+    """TTL 캐시 저장 (상한 초과 시 만료 엔트리 정리)"""
+    with _RESPONSE_CACHE_LOCK:
+        if len(_response_cache) >= _RESPONSE_CACHE_MAX:
+            now = time.monotonic()
+            for k in [k for k, (exp, _) in _response_cache.items() if exp <= now]:
+                del _response_cache[k]
+            if len(_response_cache) >= _RESPONSE_CACHE_MAX:
+                _response_cache.clear()
+        _response_cache[key] = (time.monotonic() + ttl, copy.deepcopy(response))
+
+
+def _acquire_rate_slot():
+    """전역 rate limiter에서 요청 슬롯 1개 확보 (필요 시 대기)
+
+    버스트 허용량은 의도적으로 0: KIS는 초당 건수를 경성 제한하므로
+    평균이 아닌 순간 요청률도 20건/초를 넘기지 않도록 균등 간격을 유지한다.
+    """
+    with _RATE_LOCK:
+        now = time.monotonic()
+        slot = max(_rate_state["next_slot"], now)
+        _rate_state["next_slot"] = slot + _MIN_INTERVAL
+    wait = slot - now
+    if wait > 0:
+        time.sleep(wait)
+
+
 class KISClient:
     """한국투자증권 API 클라이언트
 
@@ -53,21 +150,55 @@ class KISClient:
     3. 재발급은 1일 1회 제한이므로, 마지막 발급 시간을 기록하여 중복 발급 방지
     """
 
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Args:
+            session: 공유 requests.Session (없으면 자체 생성)
+                     keep-alive 재사용으로 호출마다 TCP+TLS 핸드셰이크를 생략
+        """
         # Supabase에서 KIS API 키 조회 시도, 없으면 환경변수 사용
         self._load_credentials()
         self.base_url = KIS_BASE_URL
+        if session is not None:
+            # 주입된 공유 세션은 어댑터를 호출 측이 관리한다. 여기서 재마운트하면
+            # 기존 커넥션 풀이 통째로 버려져 인스턴스 간 keep-alive 재사용이 깨진다.
+            self._session = session
+        else:
+            self._session = requests.Session()
+            # KIS 호스트용 커넥션 풀 확장: 기본(10)보다 큰 keep-alive 풀을 유지하여
+            # 병렬 스레드가 소켓을 새로 열지 않고 재사용 (rate limit 20건/초에 맞춤)
+            self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+
+        # 호출마다 바뀌지 않는 공통 헤더 템플릿 (요청별로 copy 후
+        # authorization/tr_id/tr_cont만 추가 — 호출당 dict 리터럴 재구성 방지)
+        self._base_headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "appkey": self.app_key,
+            "appsecret": self.app_secret,
+            "custtype": "P",  # 개인
+        }
+        # Bearer 헤더 문자열 캐시 (토큰이 바뀔 때만 재생성)
+        self._auth_token: Optional[str] = None
+        self._auth_header: Optional[str] = None
 
         # 토큰 캐시 파일 경로
         self._token_cache_path = ROOT_DIR / ".kis_token_cache.json"
         self._access_token: Optional[str] = None
         self._token_expires_at: Optional[datetime] = None
         self._token_issued_at: Optional[datetime] = None
+        # 유효 만료 시각의 monotonic 환산값: 호출마다 datetime 연산 대신
+        # float 비교 1회로 토큰 유효성 판정 (만료 10분 전 여유 포함)
+        self._token_valid_until_mono: float = 0.0
+
+        # Rate limiter: 초당 최대 20건 (상태는 모듈 전역 — 인스턴스 간 공유)
 
-        # Rate limiter: 초당 최대 20건
-        self._rate_lock = threading.Lock()
-        self._last_request_time = 0.0
-        self._min_interval = 0.05  # 1/20 = 50ms
+        # Single-flight: 병렬 스레드에서 동시에 들어온 동일 GET 요청 병합
+        self._inflight_lock = threading.Lock()
+        self._inflight: Dict[tuple, _InflightCall] = {}
+
+        # 기본 조회 기간 캐시: (기준일, 시작일 문자열, 종료일 문자열)
+        # 단일 튜플로만 게시하여 병렬 스레드가 반쪽 갱신을 보지 못하게 함
+        self._date_range_cache = (None, "", "")
 
         self._validate_credentials()
         self._load_cached_token()
@@ -94,13 +225,22 @@ class KISClient:
             raise ValueError("KIS_APP_SECRET 환경변수가 설정되지 않았습니다.")
 
     def _load_cached_token(self) -> bool:
-        """캐시된 토큰 로드 (Supabase 우선, 로컬 파일 폴백)"""
-        # 1. Supabase에서 토큰 로드 시도
+        """캐시된 토큰 로드 (유효한 로컬 캐시 우선, Supabase 폴백)
+
+        토큰은 1일 1회 발급이므로 로컬 파일의 토큰이 아직 유효하면
+        Supabase 왕복 없이 바로 사용한다. 로컬 토큰이 없거나 만료된
+        경우에만 공유 저장소(Supabase)를 조회한다.
+        """
+        # 1. 로컬 파일 토큰이 유효하면 네트워크 조회 생략
+        if self._load_token_from_file() and self._is_token_valid():
+            return True
+
+        # 2. Supabase에서 토큰 로드 시도 (다른 환경에서 재발급된 경우 대비)
         if self._load_token_from_supabase():
             return True
 
-        # 2. 로컬 파일에서 토큰 로드
-        return self._load_token_from_file()
+        # 3. 만료된 로컬 토큰이라도 있으면 유지 (호출 실패 시 재발급 경로로 처리)
+        return self._access_token is not None
 
     def _load_token_from_supabase(self) -> bool:
         """Supabase에서 토큰 로드"""
@@ -123,6 +263,7 @@ class KISClient:
             # timezone 정보가 없으면 UTC로 간주
             self._token_expires_at = self._parse_datetime(expires_at_str)
             self._token_issued_at = self._parse_datetime(issued_at_str)
+            self._update_token_deadline()
 
             # 토큰 상태 출력 (UTC 기준)
             now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
@@ -143,7 +284,10 @@ class KISClient:
 
     def _parse_datetime(self, dt_str: str) -> datetime:
         """ISO 형식 문자열을 datetime으로 파싱 (timezone 제거)"""
-        dt = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
+        # 'Z' 접미사만 fromisoformat이 아는 오프셋 표기로 치환
+        if dt_str.endswith('Z'):
+            dt_str = dt_str[:-1] + '+00:00'
+        dt = datetime.fromisoformat(dt_str)
         # timezone-aware면 UTC로 변환 후 naive로 변경
         if dt.tzinfo is not None:
             dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
@@ -155,8 +299,8 @@ class KISClient:
             return False
 
         try:
-            with open(self._token_cache_path, 'r') as f:
-                cache = json.load(f)
+            raw = self._token_cache_path.read_bytes()
+            cache = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
             token_data = cache.get("token", {})
             if not token_data:
@@ -165,6 +309,7 @@ class KISClient:
             self._access_token = token_data.get('access_token')
             self._token_expires_at = self._parse_datetime(token_data['expires_at'])
             self._token_issued_at = self._parse_datetime(token_data['issued_at'])
+            self._update_token_deadline()
 
             # 토큰 상태 출력 (UTC 기준)
             now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
@@ -177,7 +322,7 @@ class KISClient:
 
             return True
 
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
+        except (OSError, ValueError, KeyError) as e:  # ValueError: json/orjson 파싱 공통
             print(f"[KIS] 로컬 토큰 캐시 로드 실패: {e}")
             return False
 
@@ -202,7 +347,11 @@ class KISClient:
         )
 
     def _save_token_to_file(self):
-        """로컬 파일에 토큰 저장"""
+        """로컬 파일에 토큰 저장 (임시 파일 + os.replace로 원자적 교체)
+
+        쓰기 도중 크래시가 나도 기존 캐시가 절단된 파일로 덮이지 않는다.
+        토큰 발급은 1일 1회 제한이라 캐시 손상은 곧 발급 기회 소진이다.
+        """
         cache = {
             "token": {
                 'access_token': self._access_token,
@@ -211,8 +360,14 @@ class KISClient:
             }
         }
 
-        with open(self._token_cache_path, 'w') as f:
-            json.dump(cache, f, indent=2)
+        if orjson is not None:
+            payload = orjson.dumps(cache, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(cache, indent=2).encode("utf-8")
+
+        tmp_path = self._token_cache_path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, self._token_cache_path)
 
     def _now_utc(self) -> datetime:
         """현재 UTC 시간 반환 (timezone-naive)"""
@@ -227,11 +382,24 @@ class KISClient:
         time_since_issue = self._now_utc() - self._token_issued_at
         return time_since_issue.total_seconds() >= 23 * 3600
 
+    def _update_token_deadline(self):
+        """만료 시각(UTC datetime)을 monotonic 기준 유효 기한으로 환산
+
+        토큰 로드/발급 시점에 1회만 계산해 두면 이후 _is_token_valid는
+        datetime 생성 없이 float 비교로 끝난다.
+        """
+        if self._token_expires_at is None:
+            self._token_valid_until_mono = 0.0
+            return
+        remaining = (self._token_expires_at - self._now_utc()).total_seconds() - 600
+        self._token_valid_until_mono = time.monotonic() + max(0.0, remaining)
+
     def _is_token_valid(self) -> bool:
         """토큰이 유효한지 확인 (만료 10분 전까지 유효)"""
-        if not self._access_token or not self._token_expires_at:
-            return False
-        return self._now_utc() < self._token_expires_at - timedelta(minutes=10)
+        return (
+            self._access_token is not None
+            and time.monotonic() < self._token_valid_until_mono
+        )
 
     def get_access_token(self, force_refresh: bool = False) -> str:
         """OAuth 액세스 토큰 반환
@@ -288,7 +456,7 @@ class KISClient:
         print(f"[KIS] AppKey (마스킹): {masked_key}")
         print(f"[KIS] Base URL: {self.base_url}")
 
-        response = requests.post(url, headers=headers, json=body, timeout=30)
+        response = self._session.post(url, headers=headers, json=body, timeout=30)
 
         # 403 오류 시 상세 응답 출력
         if response.status_code == 403:
@@ -313,6 +481,7 @@ class KISClient:
         # 토큰 만료 시간 (보통 24시간)
         expires_in = int(data.get('expires_in', 86400))
         self._token_expires_at = self._token_issued_at + timedelta(seconds=expires_in)
+        self._update_token_deadline()
 
         self._save_token_cache()
 
@@ -337,7 +506,7 @@ class KISClient:
             "appsecret": self.app_secret,
         }
 
-        response = requests.post(url, headers=headers, json=body, timeout=30)
+        response = self._session.post(url, headers=headers, json=body, timeout=30)
         response.raise_for_status()
 
         data = response.json()
@@ -351,6 +520,7 @@ class KISClient:
         # 토큰 만료 시간 (보통 24시간)
         expires_in = int(data.get('expires_in', 86400))
         self._token_expires_at = self._token_issued_at + timedelta(seconds=expires_in)
+        self._update_token_deadline()
 
         self._save_token_cache()
 
@@ -360,18 +530,17 @@ class KISClient:
         return self._access_token
 
     def _get_headers(self, tr_id: str, tr_cont: str = "") -> Dict[str, str]:
-        """API 호출용 헤더 생성"""
+        """API 호출용 헤더 생성 (공통 템플릿 copy + 호출별 필드만 추가)"""
         token = self.get_access_token()
+        if token is not self._auth_token:
+            self._auth_token = token
+            self._auth_header = "Bearer " + token
 
-        return {
-            "Content-Type": "application/json; charset=utf-8",
-            "authorization": f"Bearer {token}",
-            "appkey": self.app_key,
-            "appsecret": self.app_secret,
-            "tr_id": tr_id,
-            "tr_cont": tr_cont,
-            "custtype": "P",  # 개인
-        }
+        headers = self._base_headers.copy()
+        headers["authorization"] = self._auth_header
+        headers["tr_id"] = tr_id
+        headers["tr_cont"] = tr_cont
+        return headers
 
     def request(
         self,
@@ -386,30 +555,81 @@ class KISClient:
         """API 요청 실행
 
         토큰 만료로 401 에러 발생 시 자동으로 토큰 재발급 후 재시도합니다.
+        병렬 스레드에서 동일한 GET 요청이 동시에 들어오면 1회만 호출하고
+        응답을 공유합니다 (single-flight). rate limit 소모량 절감.
         """
-        # Rate limiting 적용 (초당 최대 20건)
-        with self._rate_lock:
-            now = time.time()
-            elapsed = now - self._last_request_time
-            if elapsed < self._min_interval:
-                time.sleep(self._min_interval - elapsed)
-            self._last_request_time = time.time()
+        if method.upper() != "GET":
+            return self._do_request(method, path, tr_id, params, body, tr_cont, _retry)
+
+        key = (path, tr_id, tr_cont, tuple(sorted(params.items())) if params else ())
+
+        # 느리게 변하는 엔드포인트는 TTL 캐시 우선 조회
+        ttl = _RESPONSE_TTL_BY_TR_ID.get(tr_id)
+        if ttl is not None:
+            cached = _cached_response(key)
+            if cached is not None:
+                return cached
+
+        with self._inflight_lock:
+            call = self._inflight.get(key)
+            if call is None:
+                call = _InflightCall()
+                self._inflight[key] = call
+                is_owner = True
+            else:
+                is_owner = False
+
+        if not is_owner:
+            try:
+                return call.wait()
+            except TimeoutError:
+                # 소유 요청이 장기 지연(토큰 재발급 + 재시도 등): 병합을 포기하고
+                # 직접 호출 (None 반환으로 호출 측이 깨지는 것 방지)
+                return self._do_request(method, path, tr_id, params, body, tr_cont, _retry)
+
+        try:
+            result = self._do_request(method, path, tr_id, params, body, tr_cont, _retry)
+            # 정상 응답만 캐시 (오류 응답이 TTL 동안 고착되는 것 방지)
+            if ttl is not None and result.get("rt_cd") == "0":
+                _store_response(key, ttl, result)
+            call.set_result(result)
+            return result
+        except BaseException as e:
+            call.set_error(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _do_request(
+        self,
+        method: str,
+        path: str,
+        tr_id: str,
+        params: Dict[str, Any] = None,
+        body: Dict[str, Any] = None,
+        tr_cont: str = "",
+        _retry: bool = True,
+    ) -> Dict[str, Any]:
+        """실제 HTTP 요청 실행 (request()의 single-flight 아래 계층)"""
+        # Rate limiting 적용 (초당 최대 20건, 프로세스 전역, 대기는 락 밖에서)
+        _acquire_rate_slot()
 
         url = f"{self.base_url}{path}"
         headers = self._get_headers(tr_id, tr_cont)
 
         try:
             if method.upper() == "GET":
-                response = requests.get(url, headers=headers, params=params, timeout=30)
+                response = self._session.get(url, headers=headers, params=params, timeout=30)
             else:
-                response = requests.post(url, headers=headers, json=body, timeout=30)
+                response = self._session.post(url, headers=headers, json=body, timeout=30)
 
             # 401 Unauthorized: 토큰 만료
             if response.status_code == 401 and _retry:
                 print(f"[KIS] 토큰이 유효하지 않습니다. 재발급 시도...")
                 self._refresh_token()
                 # 재시도 (재귀 방지를 위해 _retry=False)
-                return self.request(method, path, tr_id, params, body, tr_cont, _retry=False)
+                return self._do_request(method, path, tr_id, params, body, tr_cont, _retry=False)
 
             response.raise_for_status()
             data = response.json()
@@ -420,7 +640,7 @@ class KISClient:
                 if "만료" in msg or "token" in msg.lower():
                     print(f"[KIS] 토큰이 만료되었습니다 (msg: {msg}). 재발급 시도...")
                     self._refresh_token()
-                    return self.request(method, path, tr_id, params, body, tr_cont, _retry=False)
+                    return self._do_request(method, path, tr_id, params, body, tr_cont, _retry=False)
 
             return data
 
@@ -435,13 +655,13 @@ class KISClient:
                     print(f"[KIS] 토큰이 만료되었습니다 (HTTP {response.status_code}, msg: {error_msg}). 재발급 시도...")
                     try:
                         self._refresh_token()
-                        return self.request(method, path, tr_id, params, body, tr_cont, _retry=False)
+                        return self._do_request(method, path, tr_id, params, body, tr_cont, _retry=False)
                     except TokenRefreshLimitError as limit_err:
                         # 1일 1회 제한이지만 토큰이 무효화된 경우 강제 재발급 시도
                         print(f"[KIS] {limit_err}")
                         print(f"[KIS] 토큰이 무효화되어 강제 재발급을 시도합니다...")
                         self._force_refresh_token()
-                        return self.request(method, path, tr_id, params, body, tr_cont, _retry=False)
+                        return self._do_request(method, path, tr_id, params, body, tr_cont, _retry=False)
             except TokenRefreshLimitError:
                 raise  # TokenRefreshLimitError는 그대로 전파
             except json.JSONDecodeError:
@@ -469,6 +689,25 @@ class KISClient:
 
     # ===== 개별 API 메서드 =====
 
+    def _default_date_range(self) -> tuple:
+        """기본 조회 기간 (300일 전, 당일) 문자열 반환 — 일 단위 캐시
+
+        같은 날의 반복 호출은 datetime.now()/strftime 없이 캐시를 쓰고,
+        갱신 시에도 기준 날짜를 1회만 읽어 두 문자열을 같은 날로 만든다
+        (자정 직전 now() 2회 호출이 날짜 경계를 걸치는 문제 제거).
+
+        갱신은 지역 변수로 계산한 뒤 튜플 1개 대입으로만 게시한다.
+        병렬 수집 스레드가 동시에 진입해도 빈 문자열 초기값이나
+        반쪽 갱신을 읽는 일이 없다 (중복 계산은 결과가 같아 무해).
+        """
+        today = datetime.now().date()
+        day, start, end = self._date_range_cache
+        if today != day:
+            start = (today - timedelta(days=300)).strftime("%Y%m%d")
+            end = today.strftime("%Y%m%d")
+            self._date_range_cache = (today, start, end)
+        return start, end
+
     def get_stock_price(self, stock_code: str) -> Dict[str, Any]:
         """주식현재가 시세 조회"""
         path = "/uapi/domestic-stock/v1/quotations/inquire-price"
@@ -508,10 +747,10 @@ class KISClient:
         path = "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
         tr_id = "FHKST03010100"
 
-        if end_date is None:
-            end_date = datetime.now().strftime("%Y%m%d")
-        if start_date is None:
-            start_date = (datetime.now() - timedelta(days=300)).strftime("%Y%m%d")
+        if start_date is None or end_date is None:
+            default_start, default_end = self._default_date_range()
+            end_date = end_date or default_end
+            start_date = start_date or default_start
 
         params = {
             "FID_COND_MRKT_DIV_CODE": "J",
@@ -549,10 +788,10 @@ class KISClient:
         """업종 기간별 시세 조회 (코스닥 지수 일봉)"""
         path = "/uapi/domestic-stock/v1/quotations/inquire-daily-indexchartprice"
         tr_id = "FHKUP03500100"
-        if end_date is None:
-            end_date = datetime.now().strftime("%Y%m%d")
-        if start_date is None:
-            start_date = (datetime.now() - timedelta(days=300)).strftime("%Y%m%d")
+        if start_date is None or end_date is None:
+            default_start, default_end = self._default_date_range()
+            end_date = end_date or default_end
+            start_date = start_date or default_start
         params = {
             "FID_COND_MRKT_DIV_CODE": "U",
             "FID_INPUT_ISCD": index_code,
@@ -572,7 +811,7 @@ class KISClient:
         path = "/uapi/domestic-stock/v1/quotations/daily-short-sale"
         tr_id = "FHPST04830000"
         if end_date is None:
-            end_date = datetime.now().strftime("%Y%m%d")
+            end_date = self._default_date_range()[1]
         if start_date is None:
             start_date = end_date  # 당일만
         params = {
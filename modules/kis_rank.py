@@ -4,6 +4,7 @@
 - 거래대금 순위
 - 등락률 순위 (상승/하락)
 """
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Tuple
 from datetime import datetime
 
@@ -13,6 +14,9 @@ from modules.market_hours import is_market_hours
 
 from modules.utils import safe_int, safe_float
 
+# 종목별 수급 조회 병렬 스레드 수 (초당 호출 제한은 KISClient rate limiter가 보장)
+_INVESTOR_MAX_WORKERS = 8
+
 
 class KISRankAPI:
     """순위분석 API"""
@@ -668,55 +672,52 @@ class KISRankAPI:
         Returns:
             {종목코드: {"name", "foreign_net", "institution_net", "individual_net"}, ...}
         """
-        import time
-
         path = "/uapi/domestic-stock/v1/quotations/inquire-investor"
         tr_id = "FHKST01010900"
 
-        result = {}
-        total = len(stocks)
-
-        for idx, stock in enumerate(stocks):
+        def fetch_one(stock):
             code = stock.get("code", "")
             name = stock.get("name", "")
-
             if not code:
-                continue
+                return None
 
             try:
                 params = {
                     "FID_COND_MRKT_DIV_CODE": "J",
                     "FID_INPUT_ISCD": code,
                 }
-
                 response = self.client.request("GET", path, tr_id, params=params)
 
                 if response.get("rt_cd") != "0":
-                    continue
+                    return None
 
                 output = response.get("output", [])
                 if not output:
-                    continue
+                    return None
 
                 # 당일 데이터 (첫 번째 항목)
                 today = output[0]
-                result[code] = {
+                return code, {
                     "name": name,
                     "foreign_net": safe_int(today.get("frgn_ntby_qty", 0)),
                     "institution_net": safe_int(today.get("orgn_ntby_qty", 0)),
                     "individual_net": safe_int(today.get("prsn_ntby_qty", 0)),
                 }
-
             except Exception as e:
                 print(f"  ⚠ {name}({code}) 투자자 데이터 조회 실패: {e}")
-                continue
-
-            # 진행 상황 출력
-            if (idx + 1) % 10 == 0 or idx + 1 == total:
-                print(f"  진행: {idx + 1}/{total}")
+                return None
 
-            # API 호출 간격 (Rate limit 방지)
-            time.sleep(0.05)
+        # 종목별 호출을 스레드 풀로 병렬 실행
+        # (호출 간격은 KISClient 내부 rate limiter가 스레드 안전하게 보장)
+        result = {}
+        total = len(stocks)
+        with ThreadPoolExecutor(max_workers=_INVESTOR_MAX_WORKERS) as executor:
+            for idx, item in enumerate(executor.map(fetch_one, stocks)):
+                if item:
+                    result[item[0]] = item[1]
+                # 진행 상황 출력
+                if (idx + 1) % 10 == 0 or idx + 1 == total:
+                    print(f"  진행: {idx + 1}/{total}")
 
         return result
 
@@ -732,48 +733,45 @@ class KISRankAPI:
         Returns:
             {종목코드: {"name", "foreign_net", "institution_net", "individual_net": None}, ...}
         """
-        import time
-
-        result = {}
-        total = len(stocks)
-
-        for idx, stock in enumerate(stocks):
+        def fetch_one(stock):
             code = stock.get("code", "")
             name = stock.get("name", "")
-
             if not code:
-                continue
+                return None
 
             try:
                 response = self.client.get_investor_trend_estimate(code)
 
                 if response.get("rt_cd") != "0":
-                    continue
+                    return None
 
                 output2 = response.get("output2", [])
                 if not output2:
-                    continue
+                    return None
 
                 # bsop_hour_gb가 가장 큰(최신) 행 추출
                 latest = max(output2, key=lambda x: x.get("bsop_hour_gb", ""))
 
-                result[code] = {
+                return code, {
                     "name": name,
                     "foreign_net": safe_int(latest.get("frgn_fake_ntby_qty", 0)),
                     "institution_net": safe_int(latest.get("orgn_fake_ntby_qty", 0)),
                     "individual_net": None,
                 }
-
             except Exception as e:
                 print(f"  ⚠ {name}({code}) 추정 수급 조회 실패: {e}")
-                continue
+                return None
 
-            # 진행 상황 출력
-            if (idx + 1) % 10 == 0 or idx + 1 == total:
-                print(f"  진행: {idx + 1}/{total}")
-
-            # API 호출 간격 (Rate limit 방지)
-            time.sleep(0.05)
+        # 종목별 호출을 스레드 풀로 병렬 실행 (간격 보장은 rate limiter 담당)
+        result = {}
+        total = len(stocks)
+        with ThreadPoolExecutor(max_workers=_INVESTOR_MAX_WORKERS) as executor:
+            for idx, item in enumerate(executor.map(fetch_one, stocks)):
+                if item:
+                    result[item[0]] = item[1]
+                # 진행 상황 출력
+                if (idx + 1) % 10 == 0 or idx + 1 == total:
+                    print(f"  진행: {idx + 1}/{total}")
 
         return result
 
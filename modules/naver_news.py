@@ -10,6 +10,7 @@ from typing import Dict, List, Any, Optional
 from html import unescape
 
 from config.settings import NAVER_CLIENT_ID, NAVER_CLIENT_SECRET
+from modules.utils import KST
 
 # 영문 종목명 → 한글 별칭 매핑
 _KNOWN_ALIASES = {
@@ -39,6 +40,7 @@ class NaverNewsAPI:
         client_secret: Optional[str] = None,
         request_delay: float = 0.1,
         max_retries: int = 3,
+        session: Optional[requests.Session] = None,
     ):
         """
         Args:
@@ -46,6 +48,7 @@ class NaverNewsAPI:
             client_secret: 네이버 API 클라이언트 시크릿
             request_delay: 요청 간 딜레이 (초)
             max_retries: 최대 재시도 횟수
+            session: 공유 requests.Session (없으면 자체 생성)
         """
         self.client_id = client_id or NAVER_CLIENT_ID
         self.client_secret = client_secret or NAVER_CLIENT_SECRET
@@ -53,6 +56,7 @@ class NaverNewsAPI:
         self.request_delay = request_delay
         self.max_retries = max_retries
         self._last_request_time = 0
+        self._session = session or requests.Session()
 
     def _wait_for_rate_limit(self):
         """Rate limit 대응을 위한 딜레이"""
@@ -119,7 +123,7 @@ class NaverNewsAPI:
                 # Rate limit 대응 딜레이
                 self._wait_for_rate_limit()
 
-                response = requests.get(
+                response = self._session.get(
                     self.api_url,
                     headers=headers,
                     params=params,
@@ -244,8 +248,7 @@ class NaverNewsAPI:
         3) pubDate 내림차순 정렬, 상위 count개 반환
         """
         # 공통 필터 설정
-        kst = timezone(timedelta(hours=9))
-        cutoff = datetime.now(kst) - timedelta(days=7)
+        cutoff = datetime.now(KST) - timedelta(days=7)
         bot_pattern = re.compile(r'주가[,]?\s*\d')
 
         # 1. 원본 종목명으로 검색
@@ -274,7 +277,7 @@ class NaverNewsAPI:
 
         # 3. pubDate 내림차순 정렬
         filtered.sort(
-            key=lambda x: self._parse_datetime(x.get("_raw_pubDate", "")) or datetime.min.replace(tzinfo=kst),
+            key=lambda x: self._parse_datetime(x.get("_raw_pubDate", "")) or datetime.min.replace(tzinfo=KST),
             reverse=True,
         )
 
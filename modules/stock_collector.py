@@ -0,0 +1,49 @@
+"""
+데이터 소스별 종목 리스트를 중복 제거하여 통합하는 모듈
+- main.py(CLI 파이프라인)와 api/server.py(FastAPI)가 공유
+"""
+from itertools import chain
+from typing import Dict, List, Any
+
+
+def collect_all_stocks(
+    rising_stocks: Dict,
+    falling_stocks: Dict,
+    volume_data: Dict = None,
+    trading_value_data: Dict = None,
+    fluctuation_data: Dict = None,
+    fluctuation_direct_data: Dict = None,
+) -> List[Dict[str, Any]]:
+    """상승/하락 종목 + 추가 데이터 소스에서 중복 제거된 전체 종목 리스트 추출"""
+    stock_lists = [
+        rising_stocks.get("kospi", []),
+        rising_stocks.get("kosdaq", []),
+        falling_stocks.get("kospi", []),
+        falling_stocks.get("kosdaq", []),
+    ]
+
+    # 추가 데이터 소스
+    if volume_data:
+        stock_lists.extend([volume_data.get("kospi", []), volume_data.get("kosdaq", [])])
+    if trading_value_data:
+        stock_lists.extend([trading_value_data.get("kospi", []), trading_value_data.get("kosdaq", [])])
+    if fluctuation_data:
+        stock_lists.extend([
+            fluctuation_data.get("kospi_up", []), fluctuation_data.get("kospi_down", []),
+            fluctuation_data.get("kosdaq_up", []), fluctuation_data.get("kosdaq_down", []),
+        ])
+    if fluctuation_direct_data:
+        stock_lists.extend([
+            fluctuation_direct_data.get("kospi_up", []), fluctuation_direct_data.get("kospi_down", []),
+            fluctuation_direct_data.get("kosdaq_up", []), fluctuation_direct_data.get("kosdaq_down", []),
+        ])
+
+    # 단일 패스로 중복 제거 (중첩 루프 대신 chain으로 평탄화)
+    # dict.setdefault로 멤버십 검사+삽입을 해시 탐색 1회로 처리 (삽입 순서 유지)
+    deduped: Dict[str, Dict[str, Any]] = {}
+    for stock in chain.from_iterable(stock_lists):
+        code = stock.get("code", "")
+        if code:
+            deduped.setdefault(code, stock)
+
+    return list(deduped.values())
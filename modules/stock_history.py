@@ -1,11 +1,15 @@
 """
 종목별 최근 N일간 등락률 계산 모듈
 """
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
 from modules.kis_client import KISClient
 
+# 병렬 조회 스레드 수 (초당 호출 제한은 KISClient rate limiter가 보장)
+_MAX_WORKERS = 8
+
 
 class StockHistoryAPI:
     """종목별 일별 시세 및 등락률 계산"""
@@ -127,14 +131,11 @@ class StockHistoryAPI:
         Returns:
             {종목코드: {"changes": [...], "total_change_rate": ...}, ...}
         """
-        result = {}
-
-        for stock in stocks:
-            code = stock.get("code", "")
-            if not code:
-                continue
-
-            history = self.get_recent_changes(code, days)
-            result[code] = history
-
-        return result
+        codes = [s.get("code", "") for s in stocks if s.get("code", "")]
+        if not codes:
+            return {}
+
+        # 종목별 조회를 스레드 풀로 병렬 실행 (순차 대비 네트워크 대기 중첩)
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+            histories = executor.map(lambda code: self.get_recent_changes(code, days), codes)
+            return dict(zip(codes, histories))
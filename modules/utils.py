@@ -3,17 +3,29 @@
 여러 모듈에서 공통으로 사용하는 타입 변환 함수 및 상수.
 """
 
-from datetime import timezone, timedelta
+from datetime import datetime, timezone, timedelta
 from typing import Optional
 
 
 # ── 타임존 ─────────────────────────────────────────────────
 KST = timezone(timedelta(hours=9))
 
+# 공통 타임스탬프 포맷 (호출부마다 포맷 문자열 재생성 방지)
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def now_kst_str() -> str:
+    """현재 KST 시각을 'YYYY-MM-DD HH:MM:SS' 문자열로 반환"""
+    return datetime.now(KST).strftime(TS_FORMAT)
+
 
 # ── 타입 변환 (기본값 반환) ─────────────────────────────────
+# 이미 숫자 타입인 값은 type() 동일성 검사로 즉시 반환 (변환/예외 준비 생략)
+# — 종목당 십수 개 필드 × 수십 종목 × 매 실행에서 반복되는 핫패스
 def safe_int(value, default: int = 0) -> int:
     """빈 문자열이나 None을 안전하게 정수로 변환"""
+    if type(value) is int:
+        return value
     if value is None or value == "":
         return default
     try:
@@ -24,6 +36,10 @@ def safe_int(value, default: int = 0) -> int:
 
 def safe_float(value, default: float = 0.0) -> float:
     """빈 문자열이나 None을 안전하게 실수로 변환"""
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
     if value is None or value == "":
         return default
     try:
@@ -35,6 +51,8 @@ def safe_float(value, default: float = 0.0) -> float:
 # ── 타입 변환 (None 반환) ──────────────────────────────────
 def safe_int_or_none(value) -> Optional[int]:
     """빈 문자열이나 None이면 None 반환"""
+    if type(value) is int:
+        return value
     if value is None or value == "":
         return None
     try:
@@ -45,6 +63,10 @@ def safe_int_or_none(value) -> Optional[int]:
 
 def safe_float_or_none(value) -> Optional[float]:
     """빈 문자열이나 None이면 None 반환, 0도 None 처리 (재무 데이터용)"""
+    if type(value) is float:
+        return value if value != 0 else None
+    if type(value) is int:
+        return float(value) if value != 0 else None
     if value is None or value == "":
         return None
     try: